@@ -2,18 +2,91 @@ from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
+from flask_caching import Cache
 from datetime import timedelta
+import atexit
+import logging
+import logging.handlers
 import os
+import queue
 import cloudinary
 import cloudinary.uploader
 import cloudinary.api
+import cloudinary.api_client.call_api as cloudinary_call_api
+from cloudinary.utils import get_http_connector
+from utils.json_provider import OrjsonProvider
 
 # Initialize extensions
-db = SQLAlchemy()
+# Objects keep their loaded state after commit, so serializing a row we just
+# wrote does not trigger a SELECT to reload every attribute
+db = SQLAlchemy(session_options={'expire_on_commit': False})
 jwt = JWTManager()
+cache = Cache()
+logger = logging.getLogger(__name__)
+_log_listener = None
+_cloudinary_pool_configured = False
+
+# Cloudinary SDK release the connector patch below was checked against
+# (pinned in requirements.txt)
+CLOUDINARY_POOL_PATCH_VERSION = '1.36.0'
+
+def configure_logging(level):
+    """Route log records through a queue so handlers never write to stderr
+    on the request thread; a background listener does the actual I/O."""
+    global _log_listener
+    root = logging.getLogger()
+    root.setLevel(level)
+    if _log_listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s')
+    )
+    log_queue = queue.SimpleQueue()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    _log_listener = logging.handlers.QueueListener(
+        log_queue, stream_handler, respect_handler_level=True
+    )
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+def configure_cloudinary_pool(maxsize):
+    """Size the Cloudinary SDK's keep-alive connection pools, once per process.
+
+    The SDK has no setting for this: uploader and api_client.call_api each
+    build a private module-level urllib3 connector (_http) at import, and
+    urllib3 defaults to one connection per host, so concurrent uploads from
+    threaded workers open (and then discard) a fresh TLS connection each.
+    Replacing those connectors relies on SDK internals, so it is only done on
+    CLOUDINARY_POOL_PATCH_VERSION; on any other release the SDK defaults stay.
+    """
+    global _cloudinary_pool_configured
+    if _cloudinary_pool_configured:
+        return
+    _cloudinary_pool_configured = True
+
+    if (cloudinary.VERSION != CLOUDINARY_POOL_PATCH_VERSION
+            or not hasattr(cloudinary.uploader, '_http')
+            or not hasattr(cloudinary_call_api, '_http')):
+        logger.warning(
+            "Cloudinary pool patch was checked against %s but %s is installed; "
+            "keeping the SDK's default connection pools",
+            CLOUDINARY_POOL_PATCH_VERSION, cloudinary.VERSION
+        )
+        return
+
+    options = dict(cloudinary.CERT_KWARGS, maxsize=maxsize)
+    cloudinary.uploader._http = get_http_connector(cloudinary.config(), options)
+    cloudinary_call_api._http = get_http_connector(cloudinary.config(), options)
 
 def create_app():
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
+    
+    # ===== LOGGING CONFIGURATION =====
+    # LOG_LEVEL=DEBUG turns on per-request diagnostics (e.g. order creation)
+    configure_logging(os.environ.get('LOG_LEVEL', 'INFO').upper())
     
     # ===== RAILWAY MYSQL CONFIGURATION =====
     # Get Railway MySQL credentials from environment variables
@@ -29,11 +102,16 @@ def create_app():
     # Database Configuration
     app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URL
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    # Raise on relationship lazy loads that eager options miss (see utils/loading.py)
+    app.config['SQLALCHEMY_RAISE_ON_LAZY_LOAD'] = os.environ.get('SQLALCHEMY_RAISE_ON_LAZY_LOAD', 'false').lower() == 'true'
+    # Pool sizes are per worker process; keep pool_size + max_overflow times
+    # the number of workers under the MySQL max_connections limit
     app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
-        'pool_recycle': 280,
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 280)),
         'pool_pre_ping': True,
-        'pool_size': 10,
-        'max_overflow': 20
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 30))
     }
     
     # JWT Configuration
@@ -47,12 +125,22 @@ def create_app():
         api_secret=os.environ.get('CLOUDINARY_API_SECRET', 'SHPdRoFirRCFiUdXYjnz2GoUPSo'),
         secure=True
     )
+    configure_cloudinary_pool(int(os.environ.get('CLOUDINARY_POOL_SIZE', 10)))
     
     # Store cloudinary config in app config for easy access
     app.config['CLOUDINARY_CLOUD_NAME'] = os.environ.get('CLOUDINARY_CLOUD_NAME', 'dgzgweil5')
     app.config['CLOUDINARY_API_KEY'] = os.environ.get('CLOUDINARY_API_KEY', '737496827129559')
     app.config['CLOUDINARY_API_SECRET'] = os.environ.get('CLOUDINARY_API_SECRET', 'SHPdRoFirRCFiUdXYjnz2GoUPSo')
     
+    # ===== CACHE CONFIGURATION =====
+    # In-process cache by default; set CACHE_REDIS_URL to share it across workers
+    if os.environ.get('CACHE_REDIS_URL'):
+        app.config['CACHE_TYPE'] = 'RedisCache'
+        app.config['CACHE_REDIS_URL'] = os.environ['CACHE_REDIS_URL']
+    else:
+        app.config['CACHE_TYPE'] = 'SimpleCache'
+    app.config['CACHE_DEFAULT_TIMEOUT'] = 60
+    
     # File upload configuration
     app.config['MAX_CONTENT_LENGTH'] = 10 * 1024 * 1024  # 10MB max file size
     app.config['UPLOAD_ALLOWED_EXTENSIONS'] = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
@@ -60,6 +148,7 @@ def create_app():
     # Initialize extensions with app
     db.init_app(app)
     jwt.init_app(app)
+    cache.init_app(app)
     CORS(app, 
      resources={r"/api/*": {"origins": "*"}},
      allow_headers=["Content-Type", "Authorization"],
@@ -92,9 +181,14 @@ def create_app():
     with app.app_context():
         try:
             db.create_all()
-            print("✅ Database tables created successfully")
-        except Exception as e:
-            print(f"❌ Error creating tables: {str(e)}")
+            # create_all() skips tables that already exist, so also add any
+            # indexes declared on the models that the live schema is missing
+            for table in db.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.create(bind=db.engine, checkfirst=True)
+            logger.info("Database tables created successfully")
+        except Exception:
+            logger.exception("Error creating tables")
     
     @app.route('/')
     def index():
@@ -1,14 +1,38 @@
 from app import db
+from models.products import Inventory
+from sqlalchemy import case, update
 from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Status values, shared by the column enums and the route-level checks
+ORDER_STATUSES = ('Pending', 'Confirmed', 'Preparing', 'Ready', 'Delivered', 'Completed', 'Cancelled')
+COMPLETED_ORDER_STATUSES = ('Delivered', 'Completed')
+RESERVATION_STATUSES = ('Confirmed', 'Cancelled', 'Pending')
+UNCANCELLABLE_ORDER_STATUSES = frozenset({'Delivered', 'Completed', 'Cancelled'})
+CANCELLABLE_ORDER_STATUSES = frozenset(ORDER_STATUSES) - UNCANCELLABLE_ORDER_STATUSES
+# Customers can only cancel before the seller starts preparing the order
+CUSTOMER_CANCELLABLE_ORDER_STATUSES = frozenset({'Pending', 'Confirmed'})
 
 class Order(db.Model):
     __tablename__ = 'orders'
+    __table_args__ = (
+        db.Index('ix_order_cust_date', 'customerId', 'orderDate'),
+        db.Index('ix_order_cust_status', 'customerId', 'status'),
+        # Seller order lists, revenue and analytics filter on seller + status
+        # and range/sort on orderDate
+        db.Index('ix_order_seller_status_date', 'sellerId', 'status', 'orderDate'),
+        # Unfiltered seller order list: ORDER BY orderDate DESC, orderId DESC
+        # (InnoDB appends the primary key to secondary indexes)
+        db.Index('ix_order_seller_date', 'sellerId', 'orderDate'),
+    )
     
     orderId = db.Column(db.Integer, primary_key=True)
     customerId = db.Column(db.Integer, db.ForeignKey('customer.customerId'), nullable=False)
     sellerId = db.Column(db.Integer, db.ForeignKey('seller.sellerId'), nullable=False)
     orderDate = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
-    status = db.Column(db.Enum('Pending', 'Confirmed', 'Preparing', 'Ready', 'Delivered', 'Completed', 'Cancelled', name='order_status'), 
+    status = db.Column(db.Enum(*ORDER_STATUSES, name='order_status'), 
                        default='Pending', nullable=False)
     type = db.Column(db.Enum('Delivery', 'Pickup', name='order_type'), default='Delivery', nullable=False)
     totalAmount = db.Column(db.Numeric(10, 2), nullable=False)
@@ -43,7 +67,7 @@ class Order(db.Model):
                 'delivery': self.delivery.to_dict() if self.delivery else None
             }
         except Exception as e:
-            print(f"Error in Order.to_dict(): {e}")
+            logger.warning("Error in Order.to_dict(): %s", e)
             return {
                 'orderId': self.orderId,
                 'customerId': self.customerId,
@@ -61,6 +85,39 @@ class Order(db.Model):
         total = sum(item.subtotal for item in self.order_items)
         self.totalAmount = total
         return total
+    
+    def cancel(self, cancellable_statuses=CANCELLABLE_ORDER_STATUSES):
+        """Cancel the order and return its items to stock, without committing.
+
+        The status change is a compare-and-set UPDATE that only matches while
+        the order is in cancellable_statuses, so when two cancels race (or the
+        status moves on meanwhile) only one restocks; otherwise this returns
+        False and the caller should roll back.
+        """
+        result = db.session.execute(
+            update(Order)
+            .where(Order.orderId == self.orderId, Order.status.in_(cancellable_statuses))
+            .values(status='Cancelled')
+        )
+        if result.rowcount == 0:
+            return False
+        
+        # Restore inventory for every product in one UPDATE ... CASE statement
+        restock = {}
+        for item in self.order_items:
+            restock[item.productId] = restock.get(item.productId, 0) + item.quantity
+        
+        if restock:
+            db.session.execute(
+                update(Inventory)
+                .where(Inventory.productId.in_(restock))
+                .values(
+                    quantityInStock=Inventory.quantityInStock + case(restock, value=Inventory.productId),
+                    lastRestocked=datetime.utcnow()
+                )
+                .execution_options(synchronize_session=False)
+            )
+        return True
 
 
 class OrderItem(db.Model):
@@ -86,7 +143,7 @@ class OrderItem(db.Model):
                 'unitPrice': float(self.product.unitPrice) if hasattr(self, 'product') and self.product else 0
             }
         except Exception as e:
-            print(f"Error in OrderItem.to_dict(): {e}")
+            logger.warning("Error in OrderItem.to_dict(): %s", e)
             return {
                 'orderItemId': self.orderItemId,
                 'orderId': self.orderId,
@@ -127,12 +184,19 @@ class Delivery(db.Model):
 
 class Reservation(db.Model):
     __tablename__ = 'reservation'
+    __table_args__ = (
+        db.Index('ix_reservation_cust_date', 'customerId', 'reservationDate'),
+        # Seller/admin reservation lists: optional ?status= filter, newest
+        # reservationDate first (paged by reservationDate, reservationId)
+        db.Index('ix_reservation_status_date', 'status', 'reservationDate'),
+        db.Index('ix_reservation_date', 'reservationDate'),
+    )
     
     reservationId = db.Column(db.Integer, primary_key=True)
     customerId = db.Column(db.Integer, db.ForeignKey('customer.customerId'), nullable=False)
     reservationDate = db.Column(db.DateTime, nullable=False)
     numberOfPeople = db.Column(db.Integer, nullable=False)
-    status = db.Column(db.Enum('Confirmed', 'Cancelled', 'Pending', name='reservation_status'), 
+    status = db.Column(db.Enum(*RESERVATION_STATUSES, name='reservation_status'), 
                        default='Pending', nullable=False)
     specialRequests = db.Column(db.Text)
     createdAt = db.Column(db.DateTime, default=datetime.utcnow)
@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field
+
+class OrderItemCreate(BaseModel):
+    productId: int
+    quantity: int = Field(..., gt=0)
+    unitPrice: Optional[float] = None
+
+class OrderCreate(BaseModel):
+    items: List[OrderItemCreate] = Field(..., min_length=1)
+    type: Literal['Delivery', 'Pickup'] = 'Delivery'
+    deliveryAddress: Optional[str] = None
+    notes: Optional[str] = None
+    estimatedTime: Optional[datetime] = None
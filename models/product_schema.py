@@ -0,0 +1,22 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+
+class ProductCreate(BaseModel):
+    productName: str = Field(..., min_length=1)
+    unitPrice: float = Field(..., gt=0)
+    description: Optional[str] = None
+    category: Optional[str] = None
+    imageUrl: Optional[str] = None
+    # Accepts true/false as well as "true"/"1"/"yes" style form values
+    isAvailable: bool = False
+
+class ProductUpdate(BaseModel):
+    productName: Optional[str] = Field(None, min_length=1)
+    unitPrice: Optional[float] = Field(None, gt=0)
+    description: Optional[str] = None
+    category: Optional[str] = None
+    imageUrl: Optional[str] = None
+    isAvailable: Optional[bool] = None
+
+class InventoryChange(BaseModel):
+    quantity_change: int
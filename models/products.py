@@ -1,8 +1,18 @@
 from app import db
+from sqlalchemy import delete, exists
 from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
 
 class Product(db.Model):
     __tablename__ = 'product'
+    __table_args__ = (
+        db.Index('ix_product_filter', 'isAvailable', 'category', 'sellerId', 'unitPrice'),
+        db.Index('ix_product_seller', 'sellerId'),
+        # FULLTEXT on MySQL; other dialects ignore the prefix
+        db.Index('ix_product_search', 'productName', 'description', mysql_prefix='FULLTEXT'),
+    )
     
     productId = db.Column(db.Integer, primary_key=True)
     sellerId = db.Column(db.Integer, db.ForeignKey('seller.sellerId'), nullable=False)
@@ -19,6 +29,18 @@ class Product(db.Model):
     inventory = db.relationship('Inventory', backref='product', uselist=False, cascade='all, delete-orphan')
     order_items = db.relationship('OrderItem', backref='product', lazy=True)
     
+    @staticmethod
+    def delete_owned(product_id, seller_id):
+        """Delete a seller's product and its inventory row without loading them.
+
+        Returns False if no such product belongs to the seller.
+        """
+        owned = exists().where(Product.productId == product_id, Product.sellerId == seller_id)
+        db.session.execute(delete(Inventory).where(Inventory.productId == product_id, owned))
+        return db.session.execute(
+            delete(Product).where(Product.productId == product_id, Product.sellerId == seller_id)
+        ).rowcount > 0
+    
     def to_dict(self):
         try:
             return {
@@ -38,7 +60,7 @@ class Product(db.Model):
                 'needsReorder': (self.inventory.quantityInStock <= self.inventory.reorderLevel) if self.inventory else False
             }
         except Exception as e:
-            print(f"Error in Product.to_dict(): {e}")
+            logger.warning("Error in Product.to_dict(): %s", e)
             return {
                 'productId': self.productId,
                 'sellerId': self.sellerId,
@@ -71,15 +93,19 @@ class Inventory(db.Model):
             'lastRestocked': self.lastRestocked.isoformat() if self.lastRestocked else None,
             'updatedAt': self.updatedAt.isoformat() if self.updatedAt else None,
             'needsReorder': self.quantityInStock <= self.reorderLevel,
-            'status': 'Low Stock' if self.quantityInStock <= self.reorderLevel else 'In Stock' if self.quantityInStock > 0 else 'Out of Stock'
+            'status': self.stock_status(self.quantityInStock, self.reorderLevel)
         }
     
+    @staticmethod
+    def stock_status(quantity, reorder_level):
+        """Stock label shown alongside inventory counts"""
+        return 'Low Stock' if quantity <= reorder_level else 'In Stock' if quantity > 0 else 'Out of Stock'
+    
     def update_stock(self, quantity_change):
         """Update stock quantity (positive to add, negative to reduce)"""
         self.quantityInStock += quantity_change
         if quantity_change > 0:
             self.lastRestocked = datetime.utcnow()
-        self.updatedAt = datetime.utcnow()
         
     def check_availability(self, quantity):
         """Check if requested quantity is available"""
@@ -89,12 +115,10 @@ class Inventory(db.Model):
         """Reduce stock by quantity (for orders)"""
         if self.check_availability(quantity):
             self.quantityInStock -= quantity
-            self.updatedAt = datetime.utcnow()
             return True
         return False
     
     def add_stock(self, quantity):
         """Add stock (for restocking)"""
         self.quantityInStock += quantity
-        self.lastRestocked = datetime.utcnow()
-        self.updatedAt = datetime.utcnow()
\ No newline at end of file
+        self.lastRestocked = datetime.utcnow()
\ No newline at end of file
@@ -0,0 +1,119 @@
+from app import db
+from models.order import Order, OrderItem, Delivery
+from models.products import Product, Inventory
+from models.user import Customer, Seller
+from models.transaction import Payment
+from datetime import datetime
+from decimal import Decimal
+
+# Column-projection serializers for list endpoints. They build the same dicts
+# as the model to_dict() methods from plain result rows, without hydrating
+# ORM objects.
+
+def plain_value(value):
+    """Convert a column value the way the model to_dict() methods do"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+def labeled_columns(model, prefix):
+    """All columns of a model's table, labeled with a prefix"""
+    return [column.label(prefix + column.key) for column in model.__table__.c]
+
+def row_section(row, prefix):
+    """Pull one model's prefixed columns out of a result row as a dict"""
+    return {key[len(prefix):]: plain_value(value) for key, value in row.items() if key.startswith(prefix)}
+
+def order_list_query():
+    """Column query for order lists: order, names, payment and delivery in one row"""
+    return db.session.query(
+        *labeled_columns(Order, 'o_'),
+        Customer.customerName.label('customerName'),
+        Seller.storeName.label('sellerName'),
+        *labeled_columns(Payment, 'p_'),
+        *labeled_columns(Delivery, 'd_')
+    ).outerjoin(Customer, Customer.customerId == Order.customerId) \
+     .outerjoin(Seller, Seller.sellerId == Order.sellerId) \
+     .outerjoin(Payment, Payment.orderId == Order.orderId) \
+     .outerjoin(Delivery, Delivery.orderId == Order.orderId)
+
+def serialize_order_rows(rows):
+    """Build Order.to_dict()-shaped dicts from order_list_query() rows.
+
+    Items are fetched for all orders in one extra query; no ORM objects are built.
+    """
+    rows = [row._mapping for row in rows]
+    order_ids = [row['o_orderId'] for row in rows]
+    
+    items_by_order = {}
+    if order_ids:
+        item_rows = db.session.query(
+            OrderItem.orderItemId,
+            OrderItem.orderId,
+            OrderItem.productId,
+            Product.productName,
+            OrderItem.quantity,
+            OrderItem.subtotal,
+            Product.unitPrice
+        ).outerjoin(Product, Product.productId == OrderItem.productId) \
+         .filter(OrderItem.orderId.in_(order_ids)) \
+         .order_by(OrderItem.orderItemId).all()
+        
+        for item in item_rows:
+            items_by_order.setdefault(item.orderId, []).append({
+                'orderItemId': item.orderItemId,
+                'orderId': item.orderId,
+                'productId': item.productId,
+                'productName': item.productName,
+                'quantity': item.quantity,
+                'subtotal': float(item.subtotal) if item.subtotal else 0,
+                'unitPrice': float(item.unitPrice) if item.unitPrice is not None else 0
+            })
+    
+    orders = []
+    for row in rows:
+        order_dict = row_section(row, 'o_')
+        order_dict['totalAmount'] = order_dict['totalAmount'] or 0
+        order_dict['customerName'] = row['customerName']
+        order_dict['sellerName'] = row['sellerName']
+        order_dict['items'] = items_by_order.get(row['o_orderId'], [])
+        order_dict['payment'] = row_section(row, 'p_') if row['p_paymentId'] is not None else None
+        order_dict['delivery'] = row_section(row, 'd_') if row['d_deliveryId'] is not None else None
+        orders.append(order_dict)
+    return orders
+
+
+def product_list_query():
+    """Column query for product lists: product, store name and inventory in one row"""
+    return db.session.query(
+        *labeled_columns(Product, 'pr_'),
+        Seller.storeName.label('sellerName'),
+        *labeled_columns(Inventory, 'i_')
+    ).outerjoin(Seller, Seller.sellerId == Product.sellerId) \
+     .outerjoin(Inventory, Inventory.productId == Product.productId)
+
+def serialize_product_rows(rows):
+    """Build Product.to_dict()-shaped dicts from product_list_query() rows"""
+    products = []
+    for row in rows:
+        row = row._mapping
+        product_dict = row_section(row, 'pr_')
+        product_dict['unitPrice'] = product_dict['unitPrice'] or 0
+        product_dict['sellerName'] = row['sellerName']
+        
+        if row['i_inventoryId'] is not None:
+            inventory = row_section(row, 'i_')
+            quantity, reorder_level = inventory['quantityInStock'], inventory['reorderLevel']
+            inventory['needsReorder'] = quantity <= reorder_level
+            inventory['status'] = Inventory.stock_status(quantity, reorder_level)
+            product_dict['inventory'] = inventory
+            product_dict['stock'] = quantity
+            product_dict['needsReorder'] = inventory['needsReorder']
+        else:
+            product_dict['inventory'] = None
+            product_dict['stock'] = 0
+            product_dict['needsReorder'] = False
+        products.append(product_dict)
+    return products
@@ -1,28 +1,35 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from app import db
+from utils.auth import jwt_identity
+from utils.cache_keys import invalidate_product_caches
+from utils.json_provider import stream_json_list
+from utils.pagination import iter_batches
 from models.user import Admin, Customer, Seller
-from models.order import Order
+from models.order import Order, OrderItem, COMPLETED_ORDER_STATUSES
 from models.products import Product
+from models.serializers import product_list_query, serialize_product_rows
 from sqlalchemy import func
+from sqlalchemy.orm import joinedload, selectinload
 from datetime import datetime, timedelta
+from itertools import chain
+import logging
 
 admin_bp = Blueprint('admin', __name__)
+logger = logging.getLogger(__name__)
 
 def get_current_admin():
     """Helper function to get current admin from JWT token"""
     try:
-        identity = get_jwt_identity()
-        user_type, user_id = identity.split(':')
-        user_id = int(user_id)
+        user_type, user_id = jwt_identity()
         
         if user_type != 'admin':
             return None
             
-        admin = Admin.query.get(user_id)
+        admin = db.session.get(Admin, user_id)
         return admin
     except Exception as e:
-        print(f"Error getting current admin: {e}")
+        logger.warning("Error getting current admin: %s", e)
         return None
 
 # User Management
@@ -34,9 +41,9 @@ def get_all_customers():
         if not admin:
             return jsonify({'error': 'Unauthorized'}), 403
         
-        customers = Customer.query.all()
+        batches = iter_batches(Customer.query, (Customer.customerId,), lambda c: (c.customerId,))
         
-        return jsonify({'customers': [c.to_dict() for c in customers]}), 200
+        return stream_json_list('customers', chain.from_iterable(batches), Customer.to_dict)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -49,9 +56,9 @@ def get_all_sellers():
         if not admin:
             return jsonify({'error': 'Unauthorized'}), 403
         
-        sellers = Seller.query.all()
+        batches = iter_batches(Seller.query, (Seller.sellerId,), lambda s: (s.sellerId,))
         
-        return jsonify({'sellers': [s.to_dict() for s in sellers]}), 200
+        return stream_json_list('sellers', chain.from_iterable(batches), Seller.to_dict)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -64,7 +71,7 @@ def toggle_customer_active(customer_id):
         if not admin:
             return jsonify({'error': 'Unauthorized'}), 403
         
-        customer = Customer.query.get(customer_id)
+        customer = db.session.get(Customer, customer_id)
         if not customer:
             return jsonify({'error': 'Customer not found'}), 404
         
@@ -88,7 +95,7 @@ def toggle_seller_active(seller_id):
         if not admin:
             return jsonify({'error': 'Unauthorized'}), 403
         
-        seller = Seller.query.get(seller_id)
+        seller = db.session.get(Seller, seller_id)
         if not seller:
             return jsonify({'error': 'Seller not found'}), 404
         
@@ -125,7 +132,7 @@ def change_seller_password(seller_id):
         if len(data['new_password']) < 6:
             return jsonify({'error': 'Password must be at least 6 characters'}), 400
         
-        seller = Seller.query.get(seller_id)
+        seller = db.session.get(Seller, seller_id)
         if not seller:
             return jsonify({'error': 'Seller not found'}), 404
         
@@ -166,7 +173,7 @@ def change_customer_password(customer_id):
         if len(data['new_password']) < 6:
             return jsonify({'error': 'Password must be at least 6 characters'}), 400
         
-        customer = Customer.query.get(customer_id)
+        customer = db.session.get(Customer, customer_id)
         if not customer:
             return jsonify({'error': 'Customer not found'}), 404
         
@@ -212,7 +219,7 @@ def verify_seller(seller_id):
         if not admin:
             return jsonify({'error': 'Unauthorized'}), 403
         
-        seller = Seller.query.get(seller_id)
+        seller = db.session.get(Seller, seller_id)
         if not seller:
             return jsonify({'error': 'Seller not found'}), 404
         
@@ -248,13 +255,13 @@ def get_dashboard_stats():
         total_orders = Order.query.count()
         pending_orders = Order.query.filter_by(status='Pending').count()
         completed_orders = Order.query.filter(
-            Order.status.in_(['Delivered', 'Completed'])
+            Order.status.in_(COMPLETED_ORDER_STATUSES)
         ).count()
         
         # Revenue statistics (last 30 days)
         thirty_days_ago = datetime.utcnow() - timedelta(days=30)
         recent_revenue = db.session.query(func.sum(Order.totalAmount)).filter(
-            Order.status.in_(['Delivered', 'Completed']),
+            Order.status.in_(COMPLETED_ORDER_STATUSES),
             Order.orderDate >= thirty_days_ago
         ).scalar() or 0
         
@@ -316,7 +323,13 @@ def get_order_details_admin(order_id):
         if not admin:
             return jsonify({'error': 'Unauthorized'}), 403
         
-        order = Order.query.get(order_id)
+        order = db.session.get(Order, order_id, options=[
+            joinedload(Order.customer),
+            joinedload(Order.seller),
+            joinedload(Order.payment),
+            joinedload(Order.delivery),
+            selectinload(Order.order_items).selectinload(OrderItem.product)
+        ])
         if not order:
             return jsonify({'error': 'Order not found'}), 404
         
@@ -334,9 +347,12 @@ def get_all_products_admin():
         if not admin:
             return jsonify({'error': 'Unauthorized'}), 403
         
-        products = Product.query.all()
+        batches = iter_batches(
+            product_list_query(), (Product.productId,), lambda row: (row.pr_productId,)
+        )
+        products = chain.from_iterable(map(serialize_product_rows, batches))
         
-        return jsonify({'products': [p.to_dict() for p in products]}), 200
+        return stream_json_list('products', products)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -349,12 +365,13 @@ def toggle_product_availability(product_id):
         if not admin:
             return jsonify({'error': 'Unauthorized'}), 403
         
-        product = Product.query.get(product_id)
+        product = db.session.get(Product, product_id)
         if not product:
             return jsonify({'error': 'Product not found'}), 404
         
         product.isAvailable = not product.isAvailable
         db.session.commit()
+        invalidate_product_caches()
         
         return jsonify({
             'message': f'Product {"enabled" if product.isAvailable else "disabled"} successfully',
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import create_access_token, jwt_required
 from app import db
+from utils.auth import jwt_identity
 from models.user import Admin, Customer, Seller
 
 
@@ -215,17 +216,14 @@ def admin_login():
 def get_profile():
     """Get current user profile"""
     try:
-        # FIXED: Parse the identity string to get user type and ID
-        identity = get_jwt_identity()
-        user_type, user_id = identity.split(':')
-        user_id = int(user_id)
+        user_type, user_id = jwt_identity()
         
         if user_type == 'customer':
-            user = Customer.query.get(user_id)
+            user = db.session.get(Customer, user_id)
         elif user_type == 'seller':
-            user = Seller.query.get(user_id)
+            user = db.session.get(Seller, user_id)
         elif user_type == 'admin':
-            user = Admin.query.get(user_id)
+            user = db.session.get(Admin, user_id)
         else:
             return jsonify({'error': 'Invalid user type'}), 400
         
@@ -246,35 +244,36 @@ def get_profile():
 def update_profile():
     """Update current user profile"""
     try:
-        # FIXED: Parse the identity string to get user type and ID
-        identity = get_jwt_identity()
-        user_type, user_id = identity.split(':')
-        user_id = int(user_id)
+        user_type, user_id = jwt_identity()
         data = request.get_json()
         
         if user_type == 'customer':
-            user = Customer.query.get(user_id)
-            if user:
-                user.customerName = data.get('customerName', user.customerName)
-                user.phoneNumber = data.get('phoneNumber', user.phoneNumber)
-                user.address = data.get('address', user.address)
+            user = db.session.get(Customer, user_id)
+            editable_fields = ('customerName', 'phoneNumber', 'address')
         elif user_type == 'seller':
-            user = Seller.query.get(user_id)
-            if user:
-                user.storeName = data.get('storeName', user.storeName)
-                user.phoneNumber = data.get('phoneNumber', user.phoneNumber)
-                user.address = data.get('address', user.address)
+            user = db.session.get(Seller, user_id)
+            editable_fields = ('storeName', 'phoneNumber', 'address')
         else:
             return jsonify({'error': 'Profile update not available for this user type'}), 400
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
+        # Only touch fields whose value actually changes, so form resubmits
+        # don't cost an UPDATE + COMMIT round trip
+        changed = False
+        for field in editable_fields:
+            if field in data and data[field] != getattr(user, field):
+                setattr(user, field, data[field])
+                changed = True
+        
         # Update password if provided
         if 'password' in data:
             user.set_password(data['password'])
+            changed = True
         
-        db.session.commit()
+        if changed:
+            db.session.commit()
         
         return jsonify({
             'message': 'Profile updated successfully',
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from app import db
+from utils.auth import jwt_identity
 import mysql.connector
 
 cart_bp = Blueprint('cart', __name__, url_prefix='/api/carts')
@@ -22,11 +23,8 @@ def get_db_connection():
 @jwt_required()
 def get_my_cart():
     """Get or create cart for the logged-in customer"""
-    identity = get_jwt_identity()
-    
     try:
-        user_type, user_id = identity.split(':')
-        user_id = int(user_id)
+        user_type, user_id = jwt_identity()
     except:
         return jsonify({"detail": "Invalid token format"}), 401
     
@@ -69,10 +67,8 @@ def get_my_cart():
 @jwt_required()
 def get_all_carts():
     """Get all carts - admin only"""
-    identity = get_jwt_identity()
-    
     try:
-        user_type, user_id = identity.split(':')
+        user_type, user_id = jwt_identity()
     except:
         return jsonify({"detail": "Invalid token format"}), 401
     
@@ -96,11 +92,8 @@ def get_all_carts():
 @jwt_required()
 def get_cart(cart_id):
     """Get a specific cart by ID"""
-    identity = get_jwt_identity()
-    
     try:
-        user_type, user_id = identity.split(':')
-        user_id = int(user_id)
+        user_type, user_id = jwt_identity()
     except:
         return jsonify({"detail": "Invalid token format"}), 401
     
@@ -130,11 +123,8 @@ def get_cart(cart_id):
 @jwt_required()
 def clear_my_cart():
     """Clear the current customer's cart"""
-    identity = get_jwt_identity()
-    
     try:
-        user_type, user_id = identity.split(':')
-        user_id = int(user_id)
+        user_type, user_id = jwt_identity()
     except:
         return jsonify({"detail": "Invalid token format"}), 401
     
@@ -173,11 +163,8 @@ def clear_my_cart():
 @jwt_required()
 def delete_cart(cart_id):
     """Delete a cart"""
-    identity = get_jwt_identity()
-    
     try:
-        user_type, user_id = identity.split(':')
-        user_id = int(user_id)
+        user_type, user_id = jwt_identity()
     except:
         return jsonify({"detail": "Invalid token format"}), 401
     
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from app import db
+from utils.auth import jwt_identity
 import mysql.connector
 
 cartitem_bp = Blueprint('cartitem', __name__, url_prefix='/api/cart-items')
@@ -22,12 +23,8 @@ def get_db_connection():
 @jwt_required()
 def get_my_cart_with_items():
     """Get the logged-in customer's cart with all items and product details"""
-    identity = get_jwt_identity()
-    
-    # Parse identity (format: "userType:userId")
     try:
-        user_type, user_id = identity.split(':')
-        user_id = int(user_id)
+        user_type, user_id = jwt_identity()
     except:
         return jsonify({"detail": "Invalid token format"}), 401
     
@@ -83,11 +80,8 @@ def get_my_cart_with_items():
 @jwt_required()
 def add_to_cart():
     """Add an item to the customer's cart"""
-    identity = get_jwt_identity()
-    
     try:
-        user_type, user_id = identity.split(':')
-        user_id = int(user_id)
+        user_type, user_id = jwt_identity()
     except:
         return jsonify({"detail": "Invalid token format"}), 401
     
@@ -186,11 +180,8 @@ def add_to_cart():
 @jwt_required()
 def update_cart_item(cart_item_id):
     """Update the quantity of a cart item"""
-    identity = get_jwt_identity()
-    
     try:
-        user_type, user_id = identity.split(':')
-        user_id = int(user_id)
+        user_type, user_id = jwt_identity()
     except:
         return jsonify({"detail": "Invalid token format"}), 401
     
@@ -228,11 +219,13 @@ def update_cart_item(cart_item_id):
             if quantity > cart_item["stock"]:
                 return jsonify({"detail": f"Insufficient stock. Available: {cart_item['stock']}"}), 400
             
-            cursor.execute(
-                "UPDATE cartitem SET quantity = %s WHERE cartItemId = %s",
-                (quantity, cart_item_id)
-            )
-            conn.commit()
+            # Skip the write when the quantity is unchanged
+            if quantity != cart_item["quantity"]:
+                cursor.execute(
+                    "UPDATE cartitem SET quantity = %s WHERE cartItemId = %s",
+                    (quantity, cart_item_id)
+                )
+                conn.commit()
         
         cursor.execute("SELECT * FROM cartitem WHERE cartItemId = %s", (cart_item_id,))
         updated_item = cursor.fetchone()
@@ -250,11 +243,8 @@ def update_cart_item(cart_item_id):
 @jwt_required()
 def remove_from_cart(cart_item_id):
     """Remove an item from the cart"""
-    identity = get_jwt_identity()
-    
     try:
-        user_type, user_id = identity.split(':')
-        user_id = int(user_id)
+        user_type, user_id = jwt_identity()
     except:
         return jsonify({"detail": "Invalid token format"}), 401
     
@@ -297,11 +287,8 @@ def remove_from_cart(cart_item_id):
 @jwt_required()
 def clear_cart():
     """Clear all items from the customer's cart"""
-    identity = get_jwt_identity()
-    
     try:
-        user_type, user_id = identity.split(':')
-        user_id = int(user_id)
+        user_type, user_id = jwt_identity()
     except:
         return jsonify({"detail": "Invalid token format"}), 401
     
@@ -1,11 +1,12 @@
 # routes/chat_routes.py - FIXED TO MATCH AUTH JWT FORMAT
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from app import db
+from utils.auth import jwt_identity
 from models.chat_model import ChatRoom, ChatMessage
 from models.user import Customer, Seller
 from datetime import datetime
-from sqlalchemy import or_, and_
+from sqlalchemy import or_, and_, exists
 
 chat_bp = Blueprint('chat', __name__, url_prefix='/api/chat')
 
@@ -13,15 +14,12 @@ chat_bp = Blueprint('chat', __name__, url_prefix='/api/chat')
 def get_current_user_info():
     """Helper function to extract user info from JWT identity string"""
     try:
-        identity = get_jwt_identity()
-        
         # Identity format is "customer:123" or "seller:456"
-        if ':' not in identity:
+        try:
+            user_type, user_id = jwt_identity()
+        except ValueError:
             return None, None, "Invalid token format"
         
-        user_type, user_id = identity.split(':')
-        user_id = int(user_id)
-        
         if user_type not in ['customer', 'seller']:
             return None, None, "Invalid user type"
             
@@ -31,6 +29,32 @@ def get_current_user_info():
         return None, None, str(e)
 
 
+def mark_room_read(chat_room, user_type):
+    """Mark the other party's messages in a room as read for user_type.
+
+    Does nothing when the room has no unread messages for this user, so
+    polling an already-read room doesn't write to the chat_room row.
+    Returns True if anything was changed and needs committing.
+    """
+    if user_type == 'customer':
+        if not chat_room.unread_count_customer:
+            return False
+        sender_type = 'seller'
+        chat_room.unread_count_customer = 0
+    else:
+        if not chat_room.unread_count_seller:
+            return False
+        sender_type = 'customer'
+        chat_room.unread_count_seller = 0
+    
+    ChatMessage.query.filter_by(
+        chat_room_id=chat_room.id,
+        sender_type=sender_type,
+        is_read=False
+    ).update({'is_read': True})
+    return True
+
+
 @chat_bp.route('/rooms', methods=['GET'])
 @jwt_required()
 def get_chat_rooms():
@@ -68,21 +92,10 @@ def create_or_get_chat_room(other_user_id):
             # Customer chatting with seller
             customer_id = user_id
             seller_id = other_user_id
-            
-            # Verify seller exists
-            seller = Seller.query.filter_by(sellerId=seller_id).first()
-            if not seller:
-                return jsonify({'error': 'Seller not found'}), 404
-                
         elif user_type == 'seller':
             # Seller chatting with customer
             seller_id = user_id
             customer_id = other_user_id
-            
-            # Verify customer exists
-            customer = Customer.query.filter_by(customerId=customer_id).first()
-            if not customer:
-                return jsonify({'error': 'Customer not found'}), 404
         else:
             return jsonify({'error': 'Invalid user type'}), 403
         
@@ -93,6 +106,13 @@ def create_or_get_chat_room(other_user_id):
         ).first()
         
         if not chat_room:
+            # Verify the other user exists (an existing room already implies it)
+            if user_type == 'customer':
+                if not db.session.query(exists().where(Seller.sellerId == seller_id)).scalar():
+                    return jsonify({'error': 'Seller not found'}), 404
+            elif not db.session.query(exists().where(Customer.customerId == customer_id)).scalar():
+                return jsonify({'error': 'Customer not found'}), 404
+            
             # Create new chat room
             chat_room = ChatRoom(
                 customer_id=customer_id,
@@ -121,7 +141,7 @@ def get_messages(room_id):
             return jsonify({'error': f'Authentication error: {error}'}), 401
         
         # Verify user has access to this chat room
-        chat_room = ChatRoom.query.get(room_id)
+        chat_room = db.session.get(ChatRoom, room_id)
         if not chat_room:
             return jsonify({'error': 'Chat room not found'}), 404
         
@@ -139,22 +159,8 @@ def get_messages(room_id):
         messages_paginated = messages_query.paginate(page=page, per_page=per_page, error_out=False)
         
         # Mark messages as read
-        if user_type == 'customer':
-            ChatMessage.query.filter_by(
-                chat_room_id=room_id,
-                sender_type='seller',
-                is_read=False
-            ).update({'is_read': True})
-            chat_room.unread_count_customer = 0
-        else:
-            ChatMessage.query.filter_by(
-                chat_room_id=room_id,
-                sender_type='customer',
-                is_read=False
-            ).update({'is_read': True})
-            chat_room.unread_count_seller = 0
-        
-        db.session.commit()
+        if mark_room_read(chat_room, user_type):
+            db.session.commit()
         
         # Reverse messages to show oldest first
         messages = list(reversed(messages_paginated.items))
@@ -191,7 +197,7 @@ def send_message(room_id):
             return jsonify({'error': 'Message cannot be empty'}), 400
         
         # Verify user has access to this chat room
-        chat_room = ChatRoom.query.get(room_id)
+        chat_room = db.session.get(ChatRoom, room_id)
         if not chat_room:
             return jsonify({'error': 'Chat room not found'}), 404
         
@@ -214,11 +220,12 @@ def send_message(room_id):
         chat_room.last_message = message_text[:100]
         chat_room.last_message_time = datetime.utcnow()
         
-        # Increment unread count for the receiver
+        # Increment unread count for the receiver in SQL so concurrent
+        # senders can't overwrite each other's increments
         if user_type == 'customer':
-            chat_room.unread_count_seller += 1
+            chat_room.unread_count_seller = ChatRoom.unread_count_seller + 1
         else:
-            chat_room.unread_count_customer += 1
+            chat_room.unread_count_customer = ChatRoom.unread_count_customer + 1
         
         db.session.add(new_message)
         db.session.commit()
@@ -242,7 +249,7 @@ def mark_messages_read(room_id):
         if error:
             return jsonify({'error': f'Authentication error: {error}'}), 401
         
-        chat_room = ChatRoom.query.get(room_id)
+        chat_room = db.session.get(ChatRoom, room_id)
         if not chat_room:
             return jsonify({'error': 'Chat room not found'}), 404
         
@@ -252,22 +259,8 @@ def mark_messages_read(room_id):
             return jsonify({'error': 'Unauthorized access'}), 403
         
         # Mark messages as read based on user type
-        if user_type == 'customer':
-            ChatMessage.query.filter_by(
-                chat_room_id=room_id,
-                sender_type='seller',
-                is_read=False
-            ).update({'is_read': True})
-            chat_room.unread_count_customer = 0
-        else:
-            ChatMessage.query.filter_by(
-                chat_room_id=room_id,
-                sender_type='customer',
-                is_read=False
-            ).update({'is_read': True})
-            chat_room.unread_count_seller = 0
-        
-        db.session.commit()
+        if mark_room_read(chat_room, user_type):
+            db.session.commit()
         
         return jsonify({'success': True, 'message': 'Messages marked as read'}), 200
         
@@ -315,7 +308,7 @@ def delete_chat_room(room_id):
         if error:
             return jsonify({'error': f'Authentication error: {error}'}), 401
         
-        chat_room = ChatRoom.query.get(room_id)
+        chat_room = db.session.get(ChatRoom, room_id)
         if not chat_room:
             return jsonify({'error': 'Chat room not found'}), 404
         
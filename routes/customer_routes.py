@@ -1,25 +1,30 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from app import db
+from utils.auth import jwt_identity
+from utils.cache_keys import invalidate_product_caches, invalidate_seller_stats
 from models.user import Customer
-from models.order import Order
+from models.order import Order, OrderItem, CUSTOMER_CANCELLABLE_ORDER_STATUSES
+from sqlalchemy.orm import selectinload
+from models.serializers import order_list_query, serialize_order_rows
+from utils.pagination import paginate_query, pagination_meta
+import logging
 
 customer_bp = Blueprint('customer', __name__)
+logger = logging.getLogger(__name__)
 
 def get_current_customer():
     """Helper function to get current customer from JWT token"""
     try:
-        identity = get_jwt_identity()
-        user_type, user_id = identity.split(':')
-        user_id = int(user_id)
+        user_type, user_id = jwt_identity()
         
         if user_type != 'customer':
             return None
             
-        customer = Customer.query.get(user_id)
+        customer = db.session.get(Customer, user_id)
         return customer
     except Exception as e:
-        print(f"Error getting current customer: {e}")
+        logger.warning("Error getting current customer: %s", e)
         return None
 
 @customer_bp.route('/profile', methods=['GET'])
@@ -47,15 +52,21 @@ def update_profile():
         
         data = request.get_json()
         
-        customer.customerName = data.get('customerName', customer.customerName)
-        customer.phoneNumber = data.get('phoneNumber', customer.phoneNumber)
-        customer.address = data.get('address', customer.address)
+        # Only touch fields whose value actually changes, so form resubmits
+        # don't cost an UPDATE + COMMIT round trip
+        changed = False
+        for field in ('customerName', 'phoneNumber', 'address'):
+            if field in data and data[field] != getattr(customer, field):
+                setattr(customer, field, data[field])
+                changed = True
         
         # Update password if provided
         if 'password' in data and data['password']:
             customer.set_password(data['password'])
+            changed = True
         
-        db.session.commit()
+        if changed:
+            db.session.commit()
         
         return jsonify({
             'message': 'Profile updated successfully',
@@ -77,13 +88,18 @@ def get_customer_orders():
         
         status = request.args.get('status')
         
-        query = Order.query.filter_by(customerId=customer.customerId)
+        query = order_list_query().filter(Order.customerId == customer.customerId)
         if status:
-            query = query.filter_by(status=status)
+            query = query.filter(Order.status == status)
         
-        orders = query.order_by(Order.orderDate.desc()).all()
+        orders_paginated = paginate_query(query.order_by(Order.orderDate.desc()))
+        orders = serialize_order_rows(orders_paginated.items)
         
-        return jsonify({'orders': [order.to_dict() for order in orders]}), 200
+        return jsonify({
+            'orders': orders,
+            'count': len(orders),
+            **pagination_meta(orders_paginated)
+        }), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -115,15 +131,24 @@ def cancel_order(order_id):
         if not customer:
             return jsonify({'error': 'Customer profile not found'}), 404
         
-        order = Order.query.filter_by(orderId=order_id, customerId=customer.customerId).first()
+        order = Order.query.options(
+            selectinload(Order.order_items).selectinload(OrderItem.product)
+        ).filter_by(orderId=order_id, customerId=customer.customerId).first()
         if not order:
             return jsonify({'error': 'Order not found'}), 404
         
-        if order.status not in ['Pending', 'Confirmed']:
+        if order.status not in CUSTOMER_CANCELLABLE_ORDER_STATUSES:
             return jsonify({'error': 'Cannot cancel order at this stage'}), 400
         
-        order.status = 'Cancelled'
+        # Same compare-and-set cancel and restock as /api/orders/<id>/cancel,
+        # limited to the statuses customers may cancel from
+        if not order.cancel(CUSTOMER_CANCELLABLE_ORDER_STATUSES):
+            db.session.rollback()
+            return jsonify({'error': 'Order can no longer be cancelled'}), 409
+        
         db.session.commit()
+        invalidate_seller_stats(order.sellerId)
+        invalidate_product_caches()
         
         return jsonify({
             'message': 'Order cancelled successfully',
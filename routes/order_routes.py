@@ -1,230 +1,227 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, request, jsonify, g
+from flask_jwt_extended import jwt_required
 from app import db
-from models.order import Order, OrderItem, Delivery, Reservation
-from models.products import Product
+from utils.auth import jwt_identity
+from utils.cache_keys import invalidate_product_caches, invalidate_seller_stats
+from utils.dates import parse_iso_datetime
+from utils.loading import strict_load
+from utils.pagination import paginate_query, pagination_meta
+from utils.validation import parse_json_body
+from models.order import (
+    Order, OrderItem, Delivery, Reservation, RESERVATION_STATUSES, UNCANCELLABLE_ORDER_STATUSES
+)
+from models.products import Product, Inventory
+from models.user import Customer
 from models.transaction import Payment
-from datetime import datetime
-import uuid
+from models.order_schema import OrderCreate
+from models.serializers import order_list_query, serialize_order_rows
+from sqlalchemy import case, insert, update
+from sqlalchemy.orm import joinedload, selectinload
+import logging
+import secrets
 
 order_bp = Blueprint('order', __name__)
+logger = logging.getLogger(__name__)
 
 # Helper function to parse JWT identity
 def parse_jwt_identity():
-    """Parse JWT identity from 'type:id' format"""
-    identity = get_jwt_identity()
-    
-    if ':' in identity:
-        user_type, user_id = identity.split(':')
-        return {
-            'id': int(user_id),
+    """Parse JWT identity from 'type:id' format (cached on g for the request)"""
+    if 'jwt_ident' not in g:
+        user_type, user_id = jwt_identity()
+        g.jwt_ident = {
+            'id': user_id,
             'type': user_type
         }
-    else:
-        # Fallback for unexpected format
-        raise ValueError('Invalid token format')
+    return g.jwt_ident
+
+def order_load_options():
+    """Eager-load everything Order.to_dict() touches"""
+    return strict_load(
+        joinedload(Order.customer),
+        joinedload(Order.seller),
+        joinedload(Order.payment),
+        joinedload(Order.delivery),
+        selectinload(Order.order_items).selectinload(OrderItem.product)
+    )
+
+# Status sets checked on every request, built once
+VALID_RESERVATION_STATUSES = frozenset(RESERVATION_STATUSES)
+
+# Columns returned by the reservation list endpoint
+RESERVATION_LIST_COLUMNS = (
+    Reservation.reservationId,
+    Reservation.customerId,
+    Reservation.reservationDate,
+    Reservation.numberOfPeople,
+    Reservation.status,
+    Reservation.specialRequests,
+    Reservation.createdAt,
+    Reservation.updatedAt
+)
+
+def owned_orders(current_user):
+    """Order query scoped to the current user's own orders (admins see all)"""
+    if current_user['type'] == 'customer':
+        return Order.query.filter_by(customerId=current_user['id'])
+    if current_user['type'] == 'seller':
+        return Order.query.filter_by(sellerId=current_user['id'])
+    return Order.query
+
+def add_customer_info(res_dict, name, email, phone):
+    """Add customer contact fields to a reservation dict under both key styles"""
+    name = name or "Unknown Customer"
+    res_dict.update(customerName=name, customer_name=name)
+    if email:
+        res_dict.update(customerEmail=email, customer_email=email)
+    if phone:
+        res_dict.update(customerPhone=phone, customer_phone=phone)
 
 # ==================== CUSTOMER ORDER ROUTES ====================
 
-@order_bp.route('/create', methods=['POST', 'OPTIONS'])
-@jwt_required(optional=True)
+@order_bp.route('/create', methods=['POST'])
+@jwt_required()
 def create_order():
     """Create a new order (customer only)"""
-    if request.method == 'OPTIONS':
-        response = jsonify({'status': 'ok'})
-        response.headers.add('Access-Control-Allow-Origin', '*')
-        response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
-        response.headers.add('Access-Control-Allow-Methods', 'POST,OPTIONS')
-        return response, 200
-    
     try:
         current_user = parse_jwt_identity()
-        
-        print("=" * 50)
-        print("CREATE ORDER REQUEST")
-        print("User:", current_user)
-        print("=" * 50)
+        logger.debug("Create order request from user %s", current_user)
         
         if current_user['type'] != 'customer':
             return jsonify({'error': 'Only customers can create orders'}), 403
         
-        data = request.get_json(force=True)
-        
-        print("Full request data:", data)
-        print("Items in request:", data.get('items'))
-        print("Items type:", type(data.get('items')))
-        print("Items length:", len(data.get('items', [])))
-        print("=" * 50)
-        
-        # Validate required fields
-        if 'items' not in data or not data['items']:
-            print("ERROR: No items in request")
-            return jsonify({'error': 'Order items are required'}), 400
-        
-        # Check if items is a list
-        if not isinstance(data['items'], list):
-            print("ERROR: Items is not a list")
-            return jsonify({'error': 'Items must be a list'}), 400
-        
-        # Validate each item structure
-        for idx, item in enumerate(data['items']):
-            print(f"Validating item {idx}: {item}")
-            
-            if not isinstance(item, dict):
-                return jsonify({'error': f'Item {idx} is not a valid object'}), 400
-            
-            if 'productId' not in item:
-                return jsonify({'error': f'Item {idx} missing productId'}), 400
-            
-            if 'quantity' not in item:
-                return jsonify({'error': f'Item {idx} missing quantity'}), 400
+        # Parse and validate the raw body in one pass (pydantic-core)
+        data, error = parse_json_body(OrderCreate)
+        if error:
+            return error
+        logger.debug("Create order payload: %s", data)
+        
+        order_type = data.type
+        if order_type == 'Delivery' and not data.deliveryAddress:
+            return jsonify({'error': 'Delivery address is required for delivery orders'}), 400
+        
+        # Load every product in the order (and its inventory) up front
+        # instead of one SELECT per line item
+        product_ids = [item.productId for item in data.items]
+        products = {
+            product.productId: product
+            for product in Product.query.options(selectinload(Product.inventory))
+                                        .filter(Product.productId.in_(product_ids)).all()
+        }
         
-        print("✓ All items validated successfully")
+        # Report every unknown product id at once
+        missing_ids = [pid for pid in dict.fromkeys(product_ids) if pid not in products]
+        if missing_ids:
+            if len(missing_ids) == 1:
+                message = f'Product {missing_ids[0]} not found'
+            else:
+                message = f'Products not found: {", ".join(map(str, missing_ids))}'
+            return jsonify({'error': message, 'missingProductIds': missing_ids}), 404
         
         # Get sellerId from first product
-        first_product = Product.query.get(data['items'][0]['productId'])
-        if not first_product:
-            return jsonify({'error': 'First product not found'}), 404
-        
-        seller_id = first_product.sellerId
-        print(f"Seller ID: {seller_id}")
+        seller_id = products[product_ids[0]].sellerId
         
-        # Create order
-        order = Order(
-            customerId=current_user['id'],
-            sellerId=seller_id,
-            type=data.get('type', 'Delivery'),
-            deliveryAddress=data.get('deliveryAddress'),
-            notes=data.get('notes'),
-            totalAmount=0
-        )
-        
-        db.session.add(order)
-        db.session.flush()
-        
-        print(f"✓ Order created with ID: {order.orderId}")
-        
-        # Add order items and calculate total
+        # Price every item and tally stock before writing anything, so the
+        # order row can be inserted once with its final total
         total_amount = 0
-        items_created_count = 0
+        order_item_rows = []
+        stock_deductions = {}
         
-        print("\n--- PROCESSING ORDER ITEMS ---")
-        for idx, item in enumerate(data['items']):
-            print(f"\nItem {idx + 1}:")
-            print(f"  Raw item data: {item}")
-            
-            product_id = item['productId']
-            quantity = item['quantity']
-            
-            print(f"  Product ID: {product_id}")
-            print(f"  Quantity: {quantity}")
-            
-            product = Product.query.get(product_id)
+        for idx, item in enumerate(data.items):
+            product_id = item.productId
+            quantity = item.quantity
+            logger.debug("Item %d: pid=%s qty=%s", idx, product_id, quantity)
             
-            if not product:
-                print(f"  ERROR: Product {product_id} not found")
-                db.session.rollback()
-                return jsonify({'error': f'Product {product_id} not found'}), 404
-            
-            print(f"  ✓ Product found: {product.productName}")
-            print(f"  Available: {product.isAvailable}")
+            product = products[product_id]
             
             if not product.isAvailable:
-                print(f"  ERROR: Product not available")
-                db.session.rollback()
                 return jsonify({'error': f'Product {product.productName} is not available'}), 400
             
             # Check inventory
             if product.inventory:
-                print(f"  Current stock: {product.inventory.quantityInStock}")
                 if not product.inventory.check_availability(quantity):
-                    print(f"  ERROR: Insufficient stock")
-                    db.session.rollback()
                     return jsonify({'error': f'Insufficient stock for {product.productName}'}), 400
-                print(f"  ✓ Stock check passed")
             else:
-                print(f"  WARNING: No inventory record")
+                logger.warning("Product %s has no inventory record", product_id)
             
             # Calculate prices
-            unit_price = float(item.get('unitPrice', product.unitPrice))
+            unit_price = float(item.unitPrice if item.unitPrice is not None else product.unitPrice)
             subtotal = unit_price * quantity
             
-            print(f"  Unit price: ₱{unit_price}")
-            print(f"  Subtotal: ₱{subtotal}")
-            
-            # Create order item
-            print(f"  Creating OrderItem...")
-            order_item = OrderItem(
-                orderId=order.orderId,
-                productId=product.productId,
-                quantity=quantity,
-                subtotal=subtotal
-            )
-            
-            db.session.add(order_item)
-            items_created_count += 1
+            # Queue the order item; all items are inserted in one statement below
+            order_item_rows.append({
+                'productId': product.productId,
+                'quantity': quantity,
+                'subtotal': subtotal
+            })
             total_amount += subtotal
             
-            print(f"  ✓ OrderItem added to session (count: {items_created_count})")
-            
-            # Update inventory
+            # Tally stock to deduct; applied atomically below
             if product.inventory:
-                old_stock = product.inventory.quantityInStock
-                product.inventory.update_stock(-quantity)
-                print(f"  Inventory: {old_stock} -> {product.inventory.quantityInStock}")
-        
-        print("\n" + "=" * 50)
-        print(f"ORDER ITEMS SUMMARY:")
-        print(f"  Items processed: {len(data['items'])}")
-        print(f"  Items created: {items_created_count}")
-        print(f"  Total amount: ₱{total_amount}")
-        print("=" * 50)
-        
-        order.totalAmount = total_amount
-        
-        # Create delivery record if delivery type
-        if order.type == 'Delivery':
-            if not data.get('deliveryAddress'):
+                stock_deductions[product_id] = stock_deductions.get(product_id, 0) + quantity
+        
+        # All validation is done; everything below is the write phase
+        
+        # Deduct stock for every product in one conditional UPDATE so
+        # concurrent orders cannot oversell between the check above and the write
+        if stock_deductions:
+            deduction = case(stock_deductions, value=Inventory.productId)
+            result = db.session.execute(
+                update(Inventory)
+                .where(Inventory.productId.in_(stock_deductions), Inventory.quantityInStock >= deduction)
+                .values(quantityInStock=Inventory.quantityInStock - deduction)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount != len(stock_deductions):
                 db.session.rollback()
-                return jsonify({'error': 'Delivery address is required for delivery orders'}), 400
-            
-            delivery = Delivery(
-                orderId=order.orderId,
-                deliveryAddress=data['deliveryAddress'],
-                estimatedTime=data.get('estimatedTime')
+                short_names = [
+                    products[product_id].productName
+                    for product_id, in_stock in db.session.query(Inventory.productId, Inventory.quantityInStock)
+                                                          .filter(Inventory.productId.in_(stock_deductions))
+                    if in_stock < stock_deductions[product_id]
+                ]
+                return jsonify({'error': f'Insufficient stock for {", ".join(short_names) or "this order"}'}), 400
+        
+        # Create order with its final total (and delivery record, in the same flush)
+        order = Order(
+            customerId=current_user['id'],
+            sellerId=seller_id,
+            type=order_type,
+            deliveryAddress=data.deliveryAddress,
+            notes=data.notes,
+            totalAmount=total_amount
+        )
+        
+        if order_type == 'Delivery':
+            order.delivery = Delivery(
+                deliveryAddress=data.deliveryAddress,
+                estimatedTime=data.estimatedTime
             )
-            db.session.add(delivery)
-            print("✓ Delivery record created")
         
-        print("\nCommitting transaction...")
-        db.session.commit()
-        print("✓ TRANSACTION COMMITTED SUCCESSFULLY!")
-        print("=" * 50)
+        db.session.add(order)
+        db.session.flush()
+        
+        # Bulk insert all order items in a single executemany round trip
+        for row in order_item_rows:
+            row['orderId'] = order.orderId
+        db.session.execute(insert(OrderItem), order_item_rows)
         
-        # Verify order items were saved
-        saved_items = OrderItem.query.filter_by(orderId=order.orderId).all()
-        print(f"\n✓✓✓ VERIFICATION: {len(saved_items)} order items found in database for order {order.orderId}")
-        for si in saved_items:
-            print(f"  - Item ID: {si.orderItemId}, Product: {si.productId}, Qty: {si.quantity}")
-        print("=" * 50 + "\n")
+        db.session.commit()
+        invalidate_seller_stats(seller_id)
+        invalidate_product_caches()
+        logger.debug("Order %s committed with %d items, total %s",
+                     order.orderId, len(order_item_rows), total_amount)
         
-        response = jsonify({
+        return jsonify({
             'message': 'Order created successfully',
             'order': order.to_dict()
-        })
-        response.headers.add('Access-Control-Allow-Origin', '*')
-        return response, 201
-        
-    except ValueError as e:
-        print(f"ValueError: {e}")
-        import traceback
-        traceback.print_exc()
+        }), 201
+        
+    except ValueError:
+        logger.warning("Rejected create_order with invalid token identity")
         return jsonify({'error': 'Invalid token format. Please login again.'}), 401
     except Exception as e:
         db.session.rollback()
-        print(f"ERROR: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Failed to create order")
         return jsonify({'error': str(e)}), 500
 
 @order_bp.route('/my-orders', methods=['GET'])
@@ -239,16 +236,19 @@ def get_my_orders():
         
         status = request.args.get('status')
         
-        query = Order.query.filter_by(customerId=current_user['id'])
+        # Plain column rows instead of ORM objects; see serialize_order_rows()
+        query = order_list_query().filter(Order.customerId == current_user['id'])
         
         if status:
-            query = query.filter_by(status=status)
+            query = query.filter(Order.status == status)
         
-        orders = query.order_by(Order.orderDate.desc()).all()
+        orders_paginated = paginate_query(query.order_by(Order.orderDate.desc()))
+        orders = serialize_order_rows(orders_paginated.items)
         
         return jsonify({
-            'orders': [order.to_dict() for order in orders],
-            'count': len(orders)
+            'orders': orders,
+            'count': len(orders),
+            **pagination_meta(orders_paginated)
         }), 200
         
     except ValueError:
@@ -264,15 +264,14 @@ def get_order(order_id):
     try:
         current_user = parse_jwt_identity()
         
-        order = Order.query.get(order_id)
+        # Ownership is part of the lookup; other users' orders read as not found
+        order = owned_orders(current_user).options(
+            *order_load_options()
+        ).filter_by(orderId=order_id).first()
         
         if not order:
             return jsonify({'error': 'Order not found'}), 404
         
-        # Check if user has permission to view this order
-        if current_user['type'] == 'customer' and order.customerId != current_user['id']:
-            return jsonify({'error': 'You can only view your own orders'}), 403
-        
         return jsonify({'order': order.to_dict()}), 200
         
     except ValueError:
@@ -291,25 +290,25 @@ def cancel_order(order_id):
         if current_user['type'] != 'customer':
             return jsonify({'error': 'Only customers can cancel orders'}), 403
         
-        order = Order.query.get(order_id)
+        order = owned_orders(current_user).options(
+            selectinload(Order.order_items).selectinload(OrderItem.product)
+        ).filter_by(orderId=order_id).first()
         
         if not order:
             return jsonify({'error': 'Order not found'}), 404
         
-        if order.customerId != current_user['id']:
-            return jsonify({'error': 'You can only cancel your own orders'}), 403
-        
-        if order.status in ['Delivered', 'Cancelled']:
+        if order.status in UNCANCELLABLE_ORDER_STATUSES:
             return jsonify({'error': f'Cannot cancel order with status {order.status}'}), 400
         
-        order.status = 'Cancelled'
-        
-        # Restore inventory
-        for item in order.order_items:
-            if item.product.inventory:
-                item.product.inventory.update_stock(item.quantity)
+        # Order.cancel() compare-and-sets the status, so a concurrent cancel
+        # cannot restock the same items twice
+        if not order.cancel():
+            db.session.rollback()
+            return jsonify({'error': 'Order can no longer be cancelled'}), 409
         
         db.session.commit()
+        invalidate_seller_stats(order.sellerId)
+        invalidate_product_caches()
         
         return jsonify({
             'message': 'Order cancelled successfully',
@@ -325,32 +324,24 @@ def cancel_order(order_id):
 
 # ==================== PAYMENT ROUTES ====================
 
-@order_bp.route('/<int:order_id>/payment', methods=['POST', 'OPTIONS'])
-@jwt_required(optional=True)
+@order_bp.route('/<int:order_id>/payment', methods=['POST'])
+@jwt_required()
 def create_payment(order_id):
     """Create payment for an order"""
-    # Handle preflight OPTIONS request
-    if request.method == 'OPTIONS':
-        response = jsonify({'status': 'ok'})
-        response.headers.add('Access-Control-Allow-Origin', '*')
-        response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
-        response.headers.add('Access-Control-Allow-Methods', 'POST,OPTIONS')
-        return response, 200
-    
     try:
         current_user = parse_jwt_identity()
         
         if current_user['type'] != 'customer':
             return jsonify({'error': 'Only customers can make payments'}), 403
         
-        order = Order.query.get(order_id)
+        # The response includes the full order, so load everything to_dict() reads
+        order = owned_orders(current_user).options(
+            *order_load_options()
+        ).filter_by(orderId=order_id).first()
         
         if not order:
             return jsonify({'error': 'Order not found'}), 404
         
-        if order.customerId != current_user['id']:
-            return jsonify({'error': 'You can only pay for your own orders'}), 403
-        
         if order.payment:
             return jsonify({'error': 'Payment already exists for this order'}), 400
         
@@ -365,7 +356,7 @@ def create_payment(order_id):
             orderId=order.orderId,
             amount=order.totalAmount,
             paymentMethod=data['paymentMethod'],
-            transactionId=str(uuid.uuid4()),
+            transactionId=secrets.token_hex(16),
             status='Successful'  # In real app, integrate with payment gateway
         )
         
@@ -375,14 +366,13 @@ def create_payment(order_id):
         order.status = 'Confirmed'
         
         db.session.commit()
+        invalidate_seller_stats(order.sellerId)
         
-        response = jsonify({
+        return jsonify({
             'message': 'Payment successful',
             'payment': payment.to_dict(),
             'order': order.to_dict()
-        })
-        response.headers.add('Access-Control-Allow-Origin', '*')
-        return response, 201
+        }), 201
         
     except ValueError:
         return jsonify({'error': 'Invalid token format. Please login again.'}), 401
@@ -398,14 +388,13 @@ def get_payment(order_id):
     try:
         current_user = parse_jwt_identity()
         
-        order = Order.query.get(order_id)
+        order = owned_orders(current_user).options(
+            *strict_load(joinedload(Order.payment))
+        ).filter_by(orderId=order_id).first()
         
         if not order:
             return jsonify({'error': 'Order not found'}), 404
         
-        if current_user['type'] == 'customer' and order.customerId != current_user['id']:
-            return jsonify({'error': 'You can only view your own order payments'}), 403
-        
         if not order.payment:
             return jsonify({'error': 'No payment found for this order'}), 404
         
@@ -419,18 +408,10 @@ def get_payment(order_id):
 
 # ==================== RESERVATION ROUTES ====================
 
-@order_bp.route('/reservations/create', methods=['POST', 'OPTIONS'])
-@jwt_required(optional=True)
+@order_bp.route('/reservations/create', methods=['POST'])
+@jwt_required()
 def create_reservation():
     """Create a new reservation (customer only)"""
-    # Handle preflight OPTIONS request
-    if request.method == 'OPTIONS':
-        response = jsonify({'status': 'ok'})
-        response.headers.add('Access-Control-Allow-Origin', '*')
-        response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
-        response.headers.add('Access-Control-Allow-Methods', 'POST,OPTIONS')
-        return response, 200
-    
     try:
         current_user = parse_jwt_identity()
         
@@ -438,12 +419,7 @@ def create_reservation():
             return jsonify({'error': 'Only customers can create reservations'}), 403
         
         data = request.get_json()
-        
-        print("=" * 50)
-        print("CREATE RESERVATION REQUEST")
-        print("User:", current_user)
-        print("Reservation data:", data)
-        print("=" * 50)
+        logger.debug("Create reservation request from user %s: %s", current_user, data)
         
         # Validate required fields
         required_fields = ['reservationDate', 'numberOfPeople']
@@ -453,9 +429,9 @@ def create_reservation():
         
         # Parse reservation date
         try:
-            reservation_date = datetime.fromisoformat(data['reservationDate'].replace('Z', '+00:00'))
+            reservation_date = parse_iso_datetime(data['reservationDate'])
         except Exception as date_error:
-            print(f"Date parsing error: {date_error}")
+            logger.debug("Reservation date parsing error: %s", date_error)
             return jsonify({'error': 'Invalid date format'}), 400
         
         # Create reservation
@@ -469,24 +445,19 @@ def create_reservation():
         db.session.add(reservation)
         db.session.commit()
         
-        print(f"Reservation created with ID: {reservation.reservationId}")
-        print("=" * 50)
+        logger.debug("Reservation created with ID %s", reservation.reservationId)
         
-        response = jsonify({
+        return jsonify({
             'message': 'Reservation created successfully',
             'reservation': reservation.to_dict()
-        })
-        response.headers.add('Access-Control-Allow-Origin', '*')
-        return response, 201
+        }), 201
         
-    except ValueError as e:
-        print(f"ValueError: {e}")
+    except ValueError:
+        logger.warning("Rejected create_reservation with invalid token identity")
         return jsonify({'error': 'Invalid token format. Please login again.'}), 401
     except Exception as e:
         db.session.rollback()
-        print(f"Error creating reservation: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Failed to create reservation")
         return jsonify({'error': str(e)}), 500
 
 
@@ -500,13 +471,18 @@ def get_my_reservations():
         if current_user['type'] != 'customer':
             return jsonify({'error': 'Only customers can view their reservations'}), 403
         
-        reservations = Reservation.query.filter_by(
+        reservations = Reservation.query.options(
+            *strict_load(selectinload(Reservation.customer))
+        ).filter_by(
             customerId=current_user['id']
-        ).order_by(Reservation.reservationDate.desc()).all()
+        ).order_by(Reservation.reservationDate.desc())
+        reservations_paginated = paginate_query(reservations)
+        reservations = reservations_paginated.items
         
         return jsonify({
             'reservations': [reservation.to_dict() for reservation in reservations],
-            'count': len(reservations)
+            'count': len(reservations),
+            **pagination_meta(reservations_paginated)
         }), 200
         
     except ValueError:
@@ -525,7 +501,7 @@ def cancel_reservation(reservation_id):
         if current_user['type'] != 'customer':
             return jsonify({'error': 'Only customers can cancel reservations'}), 403
         
-        reservation = Reservation.query.get(reservation_id)
+        reservation = db.session.get(Reservation, reservation_id)
         
         if not reservation:
             return jsonify({'error': 'Reservation not found'}), 404
@@ -560,35 +536,39 @@ def get_all_reservations():
             return jsonify({'error': 'Only sellers can view all reservations'}), 403
         
         status = request.args.get('status')
-        query = Reservation.query
+        
+        # Select only the columns the response needs, joined to the customer,
+        # instead of hydrating Reservation and Customer objects per row
+        query = db.session.query(
+            *RESERVATION_LIST_COLUMNS,
+            Customer.customerName,
+            Customer.email,
+            Customer.phoneNumber
+        ).outerjoin(Customer, Customer.customerId == Reservation.customerId)
         
         if status:
-            query = query.filter_by(status=status)
+            query = query.filter(Reservation.status == status)
         
-        reservations = query.order_by(Reservation.reservationDate.desc()).all()
+        rows_paginated = paginate_query(query.order_by(Reservation.reservationDate.desc()))
+        rows = rows_paginated.items
         
         result = []
-        for reservation in reservations:
-            res_dict = reservation.to_dict()
+        for row in rows:
+            res_dict = {
+                'reservationId': row.reservationId,
+                'customerId': row.customerId,
+                'customerName': row.customerName,
+                'reservationDate': row.reservationDate.isoformat() if row.reservationDate else None,
+                'numberOfPeople': row.numberOfPeople,
+                'status': row.status,
+                'specialRequests': row.specialRequests,
+                'createdAt': row.createdAt.isoformat() if row.createdAt else None,
+                'updatedAt': row.updatedAt.isoformat() if row.updatedAt else None
+            }
             
-            # === SAFE CUSTOMER INFO (NO MORE 500 ERROR) ===
-            if hasattr(reservation, 'customer') and reservation.customer:
-                customer = reservation.customer
-                full_name = ""
-                if hasattr(customer, 'firstName') and customer.firstName:
-                    full_name += customer.firstName
-                if hasattr(customer, 'lastName') and customer.lastName:
-                    full_name += " " + customer.lastName.strip()
-                
-                res_dict['customerName'] = full_name.strip() or "Unknown Customer"
-                res_dict['customer_name'] = full_name.strip() or "Unknown Customer"
-                
-                if hasattr(customer, 'email') and customer.email:
-                    res_dict['customerEmail'] = customer.email
-                    res_dict['customer_email'] = customer.email
-                if hasattr(customer, 'phone') and customer.phone:
-                    res_dict['customerPhone'] = customer.phone
-                    res_dict['customer_phone'] = customer.phone
+            # email is NOT NULL, so a NULL here means the outer join found no customer
+            if row.email is not None:
+                add_customer_info(res_dict, row.customerName, row.email, row.phoneNumber)
             else:
                 res_dict['customerName'] = "Customer Not Found"
                 res_dict['customerEmail'] = "N/A"
@@ -597,13 +577,12 @@ def get_all_reservations():
         
         return jsonify({
             'reservations': result,
-            'count': len(result)
+            'count': len(result),
+            **pagination_meta(rows_paginated)
         }), 200
         
     except Exception as e:
-        print(f"Error fetching reservations: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Failed to fetch reservations")
         return jsonify({'error': 'Internal server error', 'details': str(e)}), 500
 
 
@@ -614,7 +593,9 @@ def get_reservation_details(reservation_id):
     try:
         current_user = parse_jwt_identity()
         
-        reservation = Reservation.query.get(reservation_id)
+        reservation = Reservation.query.options(
+            *strict_load(joinedload(Reservation.customer))
+        ).filter_by(reservationId=reservation_id).first()
         if not reservation:
             return jsonify({'error': 'Reservation not found'}), 404
         
@@ -626,24 +607,10 @@ def get_reservation_details(reservation_id):
         
         res_dict = reservation.to_dict()
         
-        # === ADD CUSTOMER INFO ONLY FOR SELLERS (SAFE) ===
-        if current_user['type'] == 'seller' and hasattr(reservation, 'customer') and reservation.customer:
+        # Add customer contact info only for sellers
+        if current_user['type'] == 'seller' and reservation.customer:
             customer = reservation.customer
-            full_name = ""
-            if hasattr(customer, 'firstName') and customer.firstName:
-                full_name += customer.firstName
-            if hasattr(customer, 'lastName') and customer.lastName:
-                full_name += " " + customer.lastName.strip()
-            
-            res_dict['customerName'] = full_name.strip() or "Unknown Customer"
-            res_dict['customer_name'] = full_name.strip() or "Unknown Customer"
-            
-            if hasattr(customer, 'email') and customer.email:
-                res_dict['customerEmail'] = customer.email
-                res_dict['customer_email'] = customer.email
-            if hasattr(customer, 'phone') and customer.phone:
-                res_dict['customerPhone'] = customer.phone
-                res_dict['customer_phone'] = customer.phone
+            add_customer_info(res_dict, customer.customerName, customer.email, customer.phoneNumber)
         
         return jsonify(res_dict), 200
         
@@ -662,7 +629,7 @@ def update_reservation_status(reservation_id):
         if current_user['type'] != 'seller':
             return jsonify({'error': 'Only sellers can update reservation status'}), 403
         
-        reservation = Reservation.query.get(reservation_id)
+        reservation = db.session.get(Reservation, reservation_id)
         if not reservation:
             return jsonify({'error': 'Reservation not found'}), 404
         
@@ -671,9 +638,8 @@ def update_reservation_status(reservation_id):
             return jsonify({'error': 'Status is required'}), 400
         
         new_status = data['status']
-        valid_statuses = ['Pending', 'Confirmed', 'Completed', 'Cancelled', 'No-show']
-        if new_status not in valid_statuses:
-            return jsonify({'error': f'Invalid status. Must be one of: {", ".join(valid_statuses)}'}), 400
+        if new_status not in VALID_RESERVATION_STATUSES:
+            return jsonify({'error': f'Invalid status. Must be one of: {", ".join(sorted(VALID_RESERVATION_STATUSES))}'}), 400
         
         reservation.status = new_status
         db.session.commit()
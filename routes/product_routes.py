@@ -1,10 +1,45 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from app import db
+from flask_jwt_extended import jwt_required
+from app import db, cache
+from utils.auth import current_seller_id
+from utils.cache_keys import (
+    CATEGORIES_CACHE_KEY, PRODUCT_LIST_TIMEOUT,
+    invalidate_product_caches, product_list_cache_key
+)
+from utils.loading import strict_load
+from utils.pagination import paginate_query, pagination_meta
 from models.products import Product, Inventory
 from models.user import Seller
+from sqlalchemy import update
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import joinedload
+import logging
+import re
 
 product_bp = Blueprint('product', __name__)
+logger = logging.getLogger(__name__)
+
+# Fields a seller may change through PUT /<id>
+PRODUCT_UPDATE_FIELDS = ('productName', 'description', 'unitPrice', 'category', 'imageUrl', 'isAvailable')
+INVENTORY_UPDATE_FIELDS = ('quantityInStock', 'reorderLevel')
+
+# InnoDB ignores FULLTEXT terms shorter than innodb_ft_min_token_size (3)
+FULLTEXT_MIN_TERM_LENGTH = 3
+
+def product_search_filter(search):
+    """Name/description search: FULLTEXT MATCH on MySQL, LIKE scan otherwise"""
+    terms = re.findall(r'\w+', search)
+    if (db.engine.dialect.name == 'mysql' and terms
+            and all(len(term) >= FULLTEXT_MIN_TERM_LENGTH for term in terms)):
+        # Every term required, each as a prefix so partial words still match
+        against = ' '.join(f'+{term}*' for term in terms)
+        return match(Product.productName, Product.description, against=against).in_boolean_mode()
+    
+    search_pattern = f'%{search}%'
+    return db.or_(
+        Product.productName.ilike(search_pattern),
+        Product.description.ilike(search_pattern)
+    )
 
 # ==================== PUBLIC PRODUCT ROUTES ====================
 
@@ -12,6 +47,13 @@ product_bp = Blueprint('product', __name__)
 def get_all_products():
     """Get all available products (public) - No auth required"""
     try:
+        # Identical filter combinations are served from cache for 30s;
+        # product writes bump the list version to invalidate every page
+        cache_key = product_list_cache_key()
+        payload = cache.get(cache_key)
+        if payload is not None:
+            return jsonify(payload), 200
+        
         # Query parameters for filtering
         category = request.args.get('category')
         search = request.args.get('search')
@@ -30,13 +72,7 @@ def get_all_products():
             query = query.filter_by(sellerId=int(seller_id))
         
         if search:
-            search_pattern = f'%{search}%'
-            query = query.filter(
-                db.or_(
-                    Product.productName.ilike(search_pattern),
-                    Product.description.ilike(search_pattern)
-                )
-            )
+            query = query.filter(product_search_filter(search))
         
         if min_price:
             query = query.filter(Product.unitPrice >= float(min_price))
@@ -44,15 +80,25 @@ def get_all_products():
         if max_price:
             query = query.filter(Product.unitPrice <= float(max_price))
         
-        products = query.all()
+        products_paginated = paginate_query(
+            query.options(*strict_load(
+                joinedload(Product.inventory),
+                joinedload(Product.seller)
+            )).order_by(Product.productId)
+        )
+        products = products_paginated.items
         
-        return jsonify({
+        payload = {
             'products': [product.to_dict() for product in products],
-            'count': len(products)
-        }), 200
+            'count': len(products),
+            **pagination_meta(products_paginated)
+        }
+        cache.set(cache_key, payload, timeout=PRODUCT_LIST_TIMEOUT)
+        
+        return jsonify(payload), 200
         
     except Exception as e:
-        print(f"Error in get_all_products: {e}")
+        logger.exception("Error in %s", request.endpoint)
         return jsonify({'error': str(e)}), 500
 
 
@@ -60,7 +106,10 @@ def get_all_products():
 def get_product(product_id):
     """Get single product details (public)"""
     try:
-        product = Product.query.get(product_id)
+        product = db.session.get(Product, product_id, options=[
+            joinedload(Product.inventory),
+            joinedload(Product.seller)
+        ])
         
         if not product:
             return jsonify({'error': 'Product not found'}), 404
@@ -75,10 +124,14 @@ def get_product(product_id):
 def get_categories():
     """Get all unique product categories (public)"""
     try:
-        categories = db.session.query(Product.category).distinct().filter(
-            Product.category.isnot(None)
-        ).all()
-        categories = [cat[0] for cat in categories if cat[0]]
+        # Cached for a minute; product writes invalidate it
+        categories = cache.get(CATEGORIES_CACHE_KEY)
+        if categories is None:
+            categories = db.session.query(Product.category).distinct().filter(
+                Product.category.isnot(None)
+            ).all()
+            categories = [cat[0] for cat in categories if cat[0]]
+            cache.set(CATEGORIES_CACHE_KEY, categories, timeout=60)
         
         return jsonify({
             'categories': categories,
@@ -93,19 +146,26 @@ def get_categories():
 def get_seller_products_public(seller_id):
     """Get all products from a specific seller (public)"""
     try:
-        seller = Seller.query.get(seller_id)
+        seller = db.session.get(Seller, seller_id)
         if not seller:
             return jsonify({'error': 'Seller not found'}), 404
         
-        products = Product.query.filter_by(
-            sellerId=seller_id, 
-            isAvailable=True
-        ).all()
+        products_paginated = paginate_query(
+            Product.query.filter_by(
+                sellerId=seller_id, 
+                isAvailable=True
+            ).options(*strict_load(
+                joinedload(Product.inventory),
+                joinedload(Product.seller)
+            )).order_by(Product.productId)
+        )
+        products = products_paginated.items
         
         return jsonify({
             'seller': seller.to_dict(),
             'products': [product.to_dict() for product in products],
-            'count': len(products)
+            'count': len(products),
+            **pagination_meta(products_paginated)
         }), 200
         
     except Exception as e:
@@ -114,34 +174,21 @@ def get_seller_products_public(seller_id):
 
 # ==================== SELLER PRODUCT MANAGEMENT ====================
 
-def get_current_seller():
-    """Helper function to get current seller from JWT token"""
-    try:
-        identity = get_jwt_identity()
-        user_type, user_id = identity.split(':')
-        user_id = int(user_id)
-        
-        if user_type != 'seller':
-            return None
-            
-        seller = Seller.query.get(user_id)
-        return seller
-    except Exception as e:
-        print(f"Error getting current seller: {e}")
-        return None
-
 
 @product_bp.route('/my-products', methods=['GET'])
 @jwt_required()
 def get_my_products():
     """Get all products for logged-in seller"""
     try:
-        seller = get_current_seller()
+        seller_id = current_seller_id()
         
-        if not seller:
+        if not seller_id:
             return jsonify({'error': 'Seller not found'}), 403
         
-        products = Product.query.filter_by(sellerId=seller.sellerId).all()
+        products = Product.query.filter_by(sellerId=seller_id).options(*strict_load(
+            joinedload(Product.inventory),
+            joinedload(Product.seller)
+        )).all()
         
         return jsonify({
             'products': [product.to_dict() for product in products],
@@ -157,9 +204,9 @@ def get_my_products():
 def create_product():
     """Create a new product (seller only)"""
     try:
-        seller = get_current_seller()
+        seller_id = current_seller_id()
         
-        if not seller:
+        if not seller_id:
             return jsonify({'error': 'Only sellers can create products'}), 403
         
         data = request.get_json()
@@ -172,7 +219,7 @@ def create_product():
         
         # Create new product
         product = Product(
-            sellerId=seller.sellerId,
+            sellerId=seller_id,
             productName=data['productName'],
             description=data.get('description'),
             unitPrice=data['unitPrice'],
@@ -181,18 +228,16 @@ def create_product():
             isAvailable=data.get('isAvailable', True)
         )
         
-        db.session.add(product)
-        db.session.flush()  # Get product ID
-        
-        # Create inventory for the product
-        inventory = Inventory(
-            productId=product.productId,
+        # Create inventory for the product; set through the relationship so
+        # both INSERTs happen in the commit's single flush
+        product.inventory = Inventory(
             quantityInStock=data.get('quantityInStock', 0),
             reorderLevel=data.get('reorderLevel', 10)
         )
         
-        db.session.add(inventory)
+        db.session.add(product)
         db.session.commit()
+        invalidate_product_caches()
         
         return jsonify({
             'message': 'Product created successfully',
@@ -209,43 +254,43 @@ def create_product():
 def update_product(product_id):
     """Update a product (seller only)"""
     try:
-        seller = get_current_seller()
+        seller_id = current_seller_id()
         
-        if not seller:
+        if not seller_id:
             return jsonify({'error': 'Only sellers can update products'}), 403
         
-        product = Product.query.get(product_id)
-        
-        if not product:
-            return jsonify({'error': 'Product not found'}), 404
-        
-        if product.sellerId != seller.sellerId:
-            return jsonify({'error': 'You can only update your own products'}), 403
-        
         data = request.get_json()
         
-        # Update product fields
-        if 'productName' in data:
-            product.productName = data['productName']
-        if 'description' in data:
-            product.description = data['description']
-        if 'unitPrice' in data:
-            product.unitPrice = data['unitPrice']
-        if 'category' in data:
-            product.category = data['category']
-        if 'imageUrl' in data:
-            product.imageUrl = data['imageUrl']
-        if 'isAvailable' in data:
-            product.isAvailable = data['isAvailable']
-        
-        # Update inventory if provided
-        if product.inventory and 'quantityInStock' in data:
-            product.inventory.quantityInStock = data['quantityInStock']
+        # Update only the fields sent, scoped to this seller's product
+        # updatedAt is stamped by the column's onupdate
+        values = {field: data[field] for field in PRODUCT_UPDATE_FIELDS if field in data}
+        updated = db.session.execute(
+            update(Product)
+            .where(Product.productId == product_id, Product.sellerId == seller_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        
+        if not updated:
+            return jsonify({'error': 'Product not found'}), 404
         
-        if product.inventory and 'reorderLevel' in data:
-            product.inventory.reorderLevel = data['reorderLevel']
+        # Update inventory if provided (no-op when the product has none)
+        inventory_values = {field: data[field] for field in INVENTORY_UPDATE_FIELDS if field in data}
+        if inventory_values:
+            db.session.execute(
+                update(Inventory)
+                .where(Inventory.productId == product_id)
+                .values(**inventory_values)
+                .execution_options(synchronize_session=False)
+            )
         
         db.session.commit()
+        invalidate_product_caches()
+        
+        product = Product.query.options(
+            joinedload(Product.inventory),
+            joinedload(Product.seller)
+        ).populate_existing().filter_by(productId=product_id).one()
         
         return jsonify({
             'message': 'Product updated successfully',
@@ -262,21 +307,17 @@ def update_product(product_id):
 def delete_product(product_id):
     """Delete a product (seller only)"""
     try:
-        seller = get_current_seller()
+        seller_id = current_seller_id()
         
-        if not seller:
+        if not seller_id:
             return jsonify({'error': 'Only sellers can delete products'}), 403
         
-        product = Product.query.get(product_id)
-        
-        if not product:
+        # Ownership is part of the DELETE itself; nothing is loaded first
+        if not Product.delete_owned(product_id, seller_id):
             return jsonify({'error': 'Product not found'}), 404
         
-        if product.sellerId != seller.sellerId:
-            return jsonify({'error': 'You can only delete your own products'}), 403
-        
-        db.session.delete(product)
         db.session.commit()
+        invalidate_product_caches()
         
         return jsonify({'message': 'Product deleted successfully'}), 200
         
@@ -290,17 +331,17 @@ def delete_product(product_id):
 def update_inventory(product_id):
     """Update product inventory (seller only)"""
     try:
-        seller = get_current_seller()
+        seller_id = current_seller_id()
         
-        if not seller:
+        if not seller_id:
             return jsonify({'error': 'Only sellers can update inventory'}), 403
         
-        product = Product.query.get(product_id)
+        product = db.session.get(Product, product_id)
         
         if not product:
             return jsonify({'error': 'Product not found'}), 404
         
-        if product.sellerId != seller.sellerId:
+        if product.sellerId != seller_id:
             return jsonify({'error': 'You can only update your own product inventory'}), 403
         
         data = request.get_json()
@@ -318,6 +359,7 @@ def update_inventory(product_id):
             product.inventory.reorderLevel = data['reorderLevel']
         
         db.session.commit()
+        invalidate_product_caches()
         
         return jsonify({
             'message': 'Inventory updated successfully',
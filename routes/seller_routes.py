@@ -1,97 +1,238 @@
 from flask import Blueprint, request, jsonify, current_app
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from app import db
-from models.user import Seller
+from flask_jwt_extended import jwt_required
+from app import db, cache
+from utils.auth import current_seller_id
+from utils.json_provider import stream_json_list
+from utils.etag import conditional_json
+from utils.loading import strict_load
+from utils.pagination import STREAM_BATCH_SIZE, iter_batches
+from utils.background import run_in_background
+from utils.rate_limit import rate_limit
+from utils.validation import parse_json_body
+from utils.cache_keys import (
+    SELLER_STATS_TIMEOUT, invalidate_product_caches,
+    invalidate_seller_stats, seller_stats_cache_key
+)
+from models.user import Customer, Seller
 from models.products import Product, Inventory
-from models.order import Order, OrderItem
-from sqlalchemy import func
+from models.order import (
+    Order, OrderItem, Reservation,
+    ORDER_STATUSES, COMPLETED_ORDER_STATUSES, RESERVATION_STATUSES
+)
+from models.product_schema import ProductCreate, ProductUpdate, InventoryChange
+from models.serializers import (
+    order_list_query, serialize_order_rows,
+    product_list_query, serialize_product_rows
+)
+from sqlalchemy import case, exists, func, update
+from sqlalchemy.orm import joinedload
 from datetime import datetime, timedelta
+from itertools import chain, islice
 import cloudinary
 import cloudinary.uploader
+import cloudinary.utils
 from werkzeug.utils import secure_filename
+from werkzeug.exceptions import RequestEntityTooLarge
+import io
+import logging
 import os
+import re
+import secrets
+import tempfile
 from sqlalchemy import func, text
 
+logger = logging.getLogger(__name__)
+
 seller_bp = Blueprint('seller', __name__)
 
-def get_current_seller():
-    """Helper function to get current seller from JWT token"""
-    try:
-        identity = get_jwt_identity()
-        user_type, user_id = identity.split(':')
-        user_id = int(user_id)
-        
-        if user_type != 'seller':
-            return None
-            
-        seller = Seller.query.get(user_id)
-        return seller
-    except Exception as e:
-        print(f"Error getting current seller: {e}")
+VALID_ORDER_STATUSES = frozenset(ORDER_STATUSES)
+VALID_RESERVATION_STATUSES = frozenset(RESERVATION_STATUSES)
+ALLOWED_IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg', '.gif', '.webp')
+# Per-seller upload limits as (requests, seconds): bursts of 10/s, 30/min
+UPLOAD_RATE_LIMITS = ((10, 1), (30, 60))
+# Leading bytes of each accepted format (WebP is RIFF....WEBP, checked separately)
+IMAGE_HEADER_SIZE = 12
+IMAGE_SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'\xff\xd8\xff', 'jpg'),
+    (b'GIF87a', 'gif'),
+    (b'GIF89a', 'gif')
+)
+# e.g. https://res.cloudinary.com/xxx/image/upload/v123/products/seller_1/abc.jpg
+# -> products/seller_1/abc (version segment and extension stripped)
+CLOUDINARY_PUBLIC_ID_RE = re.compile(r'/upload/(?:v\d+/)?(.+?)\.[^./]+$')
+
+# Revenue report window per ?period=; anything unrecognised reports a year
+REVENUE_PERIODS = {
+    'day': timedelta(days=1),
+    'week': timedelta(weeks=1),
+    'month': timedelta(days=30),
+    'year': timedelta(days=365)
+}
+
+def product_list_version(seller_id):
+    """Cheap fingerprint of a seller's products and stock, used as the list ETag.
+
+    Product and inventory writes bump updatedAt, the count catches deletes and
+    the stock total catches same-second stock changes (DATETIME has 1s resolution).
+    """
+    return (seller_id,) + tuple(db.session.query(
+        func.count(Product.productId),
+        func.max(Product.updatedAt),
+        func.max(Inventory.updatedAt),
+        func.sum(Inventory.quantityInStock),
+        func.max(Seller.storeName)
+    ).outerjoin(Inventory, Inventory.productId == Product.productId)
+     .join(Seller, Seller.sellerId == Product.sellerId)
+     .filter(Product.sellerId == seller_id).one())
+
+def cloudinary_public_id(url):
+    """Extract the public_id from a Cloudinary delivery URL, or None"""
+    if 'cloudinary.com' not in url:
         return None
+    match = CLOUDINARY_PUBLIC_ID_RE.search(url)
+    return match.group(1) if match else None
+
+def sniff_image_type(header):
+    """Image format from a file's first IMAGE_HEADER_SIZE bytes, or None"""
+    for signature, image_type in IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return image_type
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return 'webp'
+    return None
+
+def upload_too_large_response():
+    limit_mb = current_app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)
+    return jsonify({'error': f'File too large. Maximum size is {limit_mb}MB'}), 413
+
+def upload_too_large():
+    """413 response when the declared Content-Length is over MAX_CONTENT_LENGTH.
+
+    Checked before the body is read, so an oversized upload is rejected
+    without parsing it. Chunked bodies with no Content-Length still hit
+    werkzeug's RequestEntityTooLarge once the limit is crossed.
+    """
+    limit = current_app.config.get('MAX_CONTENT_LENGTH')
+    if limit and request.content_length and request.content_length > limit:
+        return upload_too_large_response()
+    return None
+
+def uploaded_image_file():
+    """The validated 'image' file from a multipart upload.
+
+    Returns (file, None), or (None, 400 response) when the file is missing,
+    has a disallowed extension or its content is not a supported image.
+    """
+    # Check if file is in request
+    if 'image' not in request.files:
+        logger.debug("Upload rejected: no image file in request")
+        return None, (jsonify({'error': 'No image file provided'}), 400)
+    
+    file = request.files['image']
+    logger.debug("File received: %s", file.filename)
+    
+    # Check if file is selected
+    if file.filename == '':
+        logger.debug("Upload rejected: empty filename")
+        return None, (jsonify({'error': 'No file selected'}), 400)
+    
+    # Check file extension
+    if not allowed_file(file.filename):
+        logger.debug("Upload rejected: invalid file type %s", file.filename)
+        return None, (jsonify({'error': 'Invalid file type. Allowed: png, jpg, jpeg, gif, webp'}), 400)
+    
+    # The extension is client-controlled; check the content really is an image
+    header = file.stream.read(IMAGE_HEADER_SIZE)
+    file.stream.seek(0)
+    if not sniff_image_type(header):
+        logger.debug("Upload rejected: %s is not an image", file.filename)
+        return None, (jsonify({'error': 'File content is not a supported image'}), 400)
+    
+    return file, None
+
+def upload_job_key(seller_id, job_id):
+    return f'upload_job:{seller_id}:{job_id}'
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
-    ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return filename.lower().endswith(ALLOWED_IMAGE_SUFFIXES)
+
+# Shared by the multipart and raw-body upload endpoints
+IMAGE_UPLOAD_OPTIONS = {
+    'resource_type': 'image',
+    'allowed_formats': ['png', 'jpg', 'jpeg', 'gif', 'webp'],
+    'transformation': [
+        {'width': 800, 'height': 800, 'crop': 'limit'},
+        {'quality': 'auto'},
+        {'fetch_format': 'auto'}
+    ]
+}
+
+# Raw-body uploads: request body is copied in STREAM_READ_SIZE pieces into a
+# spooled file (RAM up to STREAM_SPOOL_SIZE, then disk). Every upload goes to
+# Cloudinary in UPLOAD_CHUNK_SIZE parts
+STREAM_READ_SIZE = 64 * 1024
+STREAM_SPOOL_SIZE = 1024 * 1024
+UPLOAD_CHUNK_SIZE = 6_000_000
+# How long /upload-image-async results stay pollable
+UPLOAD_JOB_TIMEOUT = 60 * 60
+STREAM_IMAGE_TYPES = {
+    'image/png': 'png',
+    'image/jpeg': 'jpg',
+    'image/gif': 'gif',
+    'image/webp': 'webp'
+}
+
+def upload_to_cloudinary(file, folder="products", filename=None):
+    """Upload a seekable file to Cloudinary and return URL.
 
-def upload_to_cloudinary(file, folder="products"):
-    """Upload file to Cloudinary and return URL"""
+    Sent in UPLOAD_CHUNK_SIZE parts, so at most one chunk of the image is
+    held in memory for the request body instead of the whole file.
+    """
     try:
-        # Upload to Cloudinary
-        result = cloudinary.uploader.upload(
+        result = cloudinary.uploader.upload_large(
             file,
+            filename=filename or 'upload',
+            chunk_size=UPLOAD_CHUNK_SIZE,
             folder=folder,
-            resource_type="image",
-            allowed_formats=['png', 'jpg', 'jpeg', 'gif', 'webp'],
-            transformation=[
-                {'width': 800, 'height': 800, 'crop': 'limit'},
-                {'quality': 'auto'},
-                {'fetch_format': 'auto'}
-            ]
+            **IMAGE_UPLOAD_OPTIONS
         )
         return result['secure_url']
     except Exception as e:
-        print(f"Error uploading to Cloudinary: {e}")
+        logger.warning("Cloudinary upload failed: %s", e)
         raise e
 
 # Image Upload Endpoint
 @seller_bp.route('/upload-image', methods=['POST'])
 @jwt_required()
+@rate_limit('upload-image', *UPLOAD_RATE_LIMITS)
 def upload_image():
     """Upload product image to Cloudinary"""
+    too_large = upload_too_large()
+    if too_large:
+        return too_large
+    
     try:
-        seller = get_current_seller()
+        seller_id = current_seller_id()
         
-        if not seller:
+        if not seller_id:
             return jsonify({'error': 'Seller profile not found'}), 404
         
-        print(f"Upload request from seller ID: {seller.sellerId}")
-        print(f"Files in request: {request.files}")
-        
-        # Check if file is in request
-        if 'image' not in request.files:
-            print("ERROR: No image file in request")
-            return jsonify({'error': 'No image file provided'}), 400
-        
-        file = request.files['image']
-        print(f"File received: {file.filename}")
-        
-        # Check if file is selected
-        if file.filename == '':
-            print("ERROR: Empty filename")
-            return jsonify({'error': 'No file selected'}), 400
+        logger.debug("Upload request from seller %s", seller_id)
         
-        # Check file extension
-        if not allowed_file(file.filename):
-            print(f"ERROR: Invalid file type: {file.filename}")
-            return jsonify({'error': 'Invalid file type. Allowed: png, jpg, jpeg, gif, webp'}), 400
+        file, error = uploaded_image_file()
+        if error:
+            return error
         
         # Upload to Cloudinary
         try:
-            print("Uploading to Cloudinary...")
-            image_url = upload_to_cloudinary(file, folder=f"products/seller_{seller.sellerId}")
-            print(f"SUCCESS: Image uploaded to: {image_url}")
+            image_url = upload_to_cloudinary(
+                file.stream,
+                folder=f"products/seller_{seller_id}",
+                filename=file.filename
+            )
+            logger.info("Seller %s uploaded image %s", seller_id, image_url)
             
             return jsonify({
                 'message': 'Image uploaded successfully',
@@ -100,92 +241,243 @@ def upload_image():
             }), 200
             
         except Exception as upload_error:
-            print(f"Cloudinary upload error: {upload_error}")
+            logger.warning("Cloudinary upload error: %s", upload_error)
             return jsonify({'error': f'Failed to upload image: {str(upload_error)}'}), 500
         
+    except RequestEntityTooLarge:
+        return upload_too_large_response()
     except Exception as e:
-        print(f"Error in upload_image: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in %s", request.endpoint)
         return jsonify({'error': str(e)}), 500
 
-# Product Management
-@seller_bp.route('/products', methods=['GET'])
+@seller_bp.route('/upload-image-stream', methods=['POST'])
 @jwt_required()
-def get_seller_products():
+@rate_limit('upload-image', *UPLOAD_RATE_LIMITS)
+def upload_image_stream():
+    """Upload product image sent as the raw request body (Content-Type: image/*)"""
+    too_large = upload_too_large()
+    if too_large:
+        return too_large
+    
     try:
-        seller = get_current_seller()
+        seller_id = current_seller_id()
         
-        if not seller:
+        if not seller_id:
             return jsonify({'error': 'Seller profile not found'}), 404
         
-        products = Product.query.filter_by(sellerId=seller.sellerId).all()
-        return jsonify({'products': [p.to_dict() for p in products]}), 200
+        extension = STREAM_IMAGE_TYPES.get(request.mimetype)
+        if not extension:
+            return jsonify({'error': 'Invalid file type. Allowed: png, jpg, jpeg, gif, webp'}), 400
+        
+        # Skip werkzeug's multipart parser: copy the body straight off the socket
+        with tempfile.SpooledTemporaryFile(max_size=STREAM_SPOOL_SIZE) as spool:
+            for chunk in iter(lambda: request.stream.read(STREAM_READ_SIZE), b''):
+                spool.write(chunk)
+            
+            if not spool.tell():
+                return jsonify({'error': 'No image data provided'}), 400
+            spool.seek(0)
+            if not sniff_image_type(spool.read(IMAGE_HEADER_SIZE)):
+                return jsonify({'error': 'File content is not a supported image'}), 400
+            spool.seek(0)
+            
+            try:
+                image_url = upload_to_cloudinary(
+                    spool,
+                    folder=f"products/seller_{seller_id}",
+                    filename=f'upload.{extension}'
+                )
+            except Exception as upload_error:
+                logger.warning("Cloudinary upload error: %s", upload_error)
+                return jsonify({'error': f'Failed to upload image: {str(upload_error)}'}), 500
+        
+        return jsonify({
+            'message': 'Image uploaded successfully',
+            'imageUrl': image_url,
+            'success': True
+        }), 200
         
+    except RequestEntityTooLarge:
+        return upload_too_large_response()
     except Exception as e:
-        print(f"Error in get_seller_products: {e}")
+        logger.exception("Error in %s", request.endpoint)
         return jsonify({'error': str(e)}), 500
 
-@seller_bp.route('/products', methods=['POST'])
+@seller_bp.route('/upload-image-async', methods=['POST'])
 @jwt_required()
-def create_product():
+@rate_limit('upload-image', *UPLOAD_RATE_LIMITS)
+def upload_image_async():
+    """Accept a product image and upload it to Cloudinary in the background.
+
+    Returns 202 with a jobId straight away; poll /upload-status/<jobId> for
+    the imageUrl. Job state lives in the shared cache, so multi-worker
+    deployments need CACHE_REDIS_URL for the poll to find it.
+    """
+    too_large = upload_too_large()
+    if too_large:
+        return too_large
+    
     try:
-        seller = get_current_seller()
+        seller_id = current_seller_id()
         
-        if not seller:
+        if not seller_id:
             return jsonify({'error': 'Seller profile not found'}), 404
         
-        data = request.get_json()
+        file, error = uploaded_image_file()
+        if error:
+            return error
+        
+        # Copy the bytes out: the request's file is closed once we return
+        data = file.read()
+        filename = file.filename
+        folder = f"products/seller_{seller_id}"
+        job_id = secrets.token_hex(16)
+        key = upload_job_key(seller_id, job_id)
+        # The worker thread has no app context, so hand it the cache backend
+        backend = cache.cache
+        backend.set(key, {'status': 'pending'}, timeout=UPLOAD_JOB_TIMEOUT)
         
-        print(f"Creating product with data: {data}")
+        def upload():
+            image_url = upload_to_cloudinary(io.BytesIO(data), folder=folder, filename=filename)
+            backend.set(key, {'status': 'done', 'imageUrl': image_url}, timeout=UPLOAD_JOB_TIMEOUT)
+            return image_url
         
-        # Validate required fields
-        if not data.get('productName'):
-            return jsonify({'error': 'Product name is required'}), 400
+        def mark_failed(future):
+            # run_in_background returns None once every retry has failed
+            if not future.result():
+                backend.set(key, {'status': 'failed'}, timeout=UPLOAD_JOB_TIMEOUT)
         
-        if not data.get('unitPrice'):
-            return jsonify({'error': 'Unit price is required'}), 400
+        run_in_background(upload).add_done_callback(mark_failed)
         
-        # CRITICAL FIX: Get imageUrl and ensure it's not empty string
-        image_url = data.get('imageUrl')
-        if image_url == '':
-            image_url = None
+        return jsonify({
+            'message': 'Image upload started',
+            'jobId': job_id,
+            'status': 'pending'
+        }), 202
+        
+    except RequestEntityTooLarge:
+        return upload_too_large_response()
+    except Exception as e:
+        logger.exception("Error in %s", request.endpoint)
+        return jsonify({'error': str(e)}), 500
+
+@seller_bp.route('/upload-status/<job_id>', methods=['GET'])
+@jwt_required()
+def upload_status(job_id):
+    """Status of an /upload-image-async job: pending, done (with imageUrl) or failed"""
+    try:
+        seller_id = current_seller_id()
         
-        print(f"Image URL from request: {image_url}")
+        if not seller_id:
+            return jsonify({'error': 'Seller profile not found'}), 404
         
-        # CRITICAL FIX: Convert isAvailable to proper boolean/int
-        is_available = data.get('isAvailable')
-        if isinstance(is_available, str):
-            is_available = is_available.lower() in ['true', '1', 'yes']
-        is_available = 1 if is_available else 0
+        job = cache.get(upload_job_key(seller_id, job_id))
+        if job is None:
+            return jsonify({'error': 'Upload job not found'}), 404
         
-        # Create product with exact database field names
-        product = Product(
-            sellerId=seller.sellerId,
-            productName=data['productName'],
-            description=data.get('description') if data.get('description') else None,
-            category=data.get('category') if data.get('category') else None,
-            unitPrice=float(data['unitPrice']),
-            imageUrl=image_url,  # This will be None if empty or the Cloudinary URL
-            isAvailable=is_available
+        return jsonify({'jobId': job_id, **job}), 200
+        
+    except Exception as e:
+        logger.exception("Error in %s", request.endpoint)
+        return jsonify({'error': str(e)}), 500
+
+@seller_bp.route('/upload-signature', methods=['POST'])
+@jwt_required()
+@rate_limit('upload-image', *UPLOAD_RATE_LIMITS)
+def upload_signature():
+    """Sign a direct browser-to-Cloudinary upload into the seller's folder.
+
+    The client POSTs the file plus every returned param (and the signature)
+    to upload_url, then saves the resulting secure_url as the product's
+    imageUrl. The image never passes through this server.
+    """
+    try:
+        seller_id = current_seller_id()
+        
+        if not seller_id:
+            return jsonify({'error': 'Seller profile not found'}), 404
+        
+        config = cloudinary.config()
+        params = cloudinary.utils.cleanup_params(cloudinary.utils.build_upload_params(
+            folder=f"products/seller_{seller_id}",
+            **IMAGE_UPLOAD_OPTIONS
+        ))
+        params['signature'] = cloudinary.utils.api_sign_request(params, config.api_secret)
+        params['api_key'] = config.api_key
+        
+        return jsonify({
+            'params': params,
+            'cloud_name': config.cloud_name,
+            'upload_url': cloudinary.utils.cloudinary_api_url('upload', resource_type='image'),
+            'success': True
+        }), 200
+        
+    except Exception as e:
+        logger.exception("Error in %s", request.endpoint)
+        return jsonify({'error': str(e)}), 500
+
+# Product Management
+@seller_bp.route('/products', methods=['GET'])
+@jwt_required()
+def get_seller_products():
+    try:
+        seller_id = current_seller_id()
+        
+        if not seller_id:
+            return jsonify({'error': 'Seller profile not found'}), 404
+        
+        return conditional_json(
+            product_list_version(seller_id),
+            lambda: {'products': serialize_product_rows(
+                product_list_query().filter(Product.sellerId == seller_id).all()
+            )}
         )
         
-        db.session.add(product)
-        db.session.flush()  # Get the product ID
+    except Exception as e:
+        logger.exception("Error in %s", request.endpoint)
+        return jsonify({'error': str(e)}), 500
+
+@seller_bp.route('/products', methods=['POST'])
+@jwt_required()
+def create_product():
+    try:
+        seller_id = current_seller_id()
         
-        print(f"Product created with ID: {product.productId}, imageUrl: {product.imageUrl}")
+        if not seller_id:
+            return jsonify({'error': 'Seller profile not found'}), 404
         
-        # Create inventory record with default stock
-        inventory = Inventory(
-            productId=product.productId,
+        # Parse, coerce and validate the body in one pass
+        data, error = parse_json_body(ProductCreate)
+        if error:
+            return error
+        
+        logger.debug("Creating product with data: %s", data)
+        
+        # Create product with exact database field names; empty strings are
+        # stored as NULL
+        product = Product(
+            sellerId=seller_id,
+            productName=data.productName,
+            description=data.description or None,
+            category=data.category or None,
+            unitPrice=data.unitPrice,
+            imageUrl=data.imageUrl or None,  # None if empty, else the Cloudinary URL
+            isAvailable=1 if data.isAvailable else 0
+        )
+        
+        # Create inventory record with default stock; attached through the
+        # relationship so both rows go out in one flush and to_dict() below
+        # doesn't lazy-load it back
+        product.inventory = Inventory(
             quantityInStock=0,  # Default to 0, can be updated later
             reorderLevel=10
         )
         
-        db.session.add(inventory)
+        db.session.add(product)
         db.session.commit()
+        invalidate_product_caches()
         
-        print(f"Product saved successfully: {product.to_dict()}")
+        logger.debug("Product %s created with imageUrl %s", product.productId, product.imageUrl)
         
         return jsonify({
             'message': 'Product created successfully',
@@ -195,62 +487,53 @@ def create_product():
         
     except Exception as e:
         db.session.rollback()
-        print(f"Error in create_product: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in %s", request.endpoint)
         return jsonify({'error': str(e)}), 500
 
 @seller_bp.route('/products/<int:product_id>', methods=['PUT'])
 @jwt_required()
 def update_product(product_id):
     try:
-        seller = get_current_seller()
+        seller_id = current_seller_id()
         
-        if not seller:
+        if not seller_id:
             return jsonify({'error': 'Seller profile not found'}), 404
         
-        product = Product.query.filter_by(productId=product_id, sellerId=seller.sellerId).first()
+        product = Product.query.filter_by(productId=product_id, sellerId=seller_id).first()
         if not product:
             return jsonify({'error': 'Product not found'}), 404
         
-        data = request.get_json()
+        data, error = parse_json_body(ProductUpdate)
+        if error:
+            return error
         
-        print(f"Updating product {product_id} with data: {data}")
+        logger.debug("Updating product %s with data: %s", product_id, data)
         
-        # Update with exact database field names
-        if 'productName' in data:
-            product.productName = data['productName']
+        # Only fields present in the body are applied
+        fields = data.model_fields_set
         
-        if 'description' in data:
-            product.description = data['description'] if data['description'] else None
+        if 'productName' in fields and data.productName is not None:
+            product.productName = data.productName
         
-        if 'category' in data:
-            product.category = data['category'] if data['category'] else None
+        if 'description' in fields:
+            product.description = data.description or None
         
-        if 'unitPrice' in data:
-            product.unitPrice = float(data['unitPrice'])
+        if 'category' in fields:
+            product.category = data.category or None
         
-        # CRITICAL FIX: Handle imageUrl properly - don't set empty strings
-        if 'imageUrl' in data:
-            image_url = data['imageUrl']
-            if image_url == '':
-                # Keep existing imageUrl if new value is empty
-                pass
-            else:
-                product.imageUrl = image_url
+        if 'unitPrice' in fields and data.unitPrice is not None:
+            product.unitPrice = data.unitPrice
         
-        # CRITICAL FIX: Handle isAvailable properly
-        if 'isAvailable' in data:
-            is_available = data['isAvailable']
-            if isinstance(is_available, str):
-                is_available = is_available.lower() in ['true', '1', 'yes']
-            product.isAvailable = 1 if is_available else 0
+        # An empty imageUrl keeps the existing image
+        if data.imageUrl:
+            product.imageUrl = data.imageUrl
         
-        product.updatedAt = datetime.utcnow()
+        if data.isAvailable is not None:
+            product.isAvailable = 1 if data.isAvailable else 0
         
+        # updatedAt is stamped by the column's onupdate when anything changed
         db.session.commit()
-        
-        print(f"Product updated successfully: {product.to_dict()}")
+        invalidate_product_caches()
         
         return jsonify({
             'message': 'Product updated successfully',
@@ -259,49 +542,40 @@ def update_product(product_id):
         
     except Exception as e:
         db.session.rollback()
-        print(f"Error in update_product: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in %s", request.endpoint)
         return jsonify({'error': str(e)}), 500
 
 @seller_bp.route('/products/<int:product_id>', methods=['DELETE'])
 @jwt_required()
 def delete_product(product_id):
     try:
-        seller = get_current_seller()
+        seller_id = current_seller_id()
         
-        if not seller:
+        if not seller_id:
             return jsonify({'error': 'Seller profile not found'}), 404
         
-        product = Product.query.filter_by(productId=product_id, sellerId=seller.sellerId).first()
+        # Only the image URL is needed; ownership is enforced by the DELETE below
+        product = db.session.query(Product.imageUrl).filter_by(
+            productId=product_id, sellerId=seller_id
+        ).first()
         if not product:
             return jsonify({'error': 'Product not found'}), 404
         
-        # Delete image from Cloudinary if exists
-        if product.imageUrl:
-            try:
-                # Extract public_id from URL
-                # Example URL: https://res.cloudinary.com/xxx/image/upload/v123/products/seller_1/abc.jpg
-                url_parts = product.imageUrl.split('/')
-                if 'cloudinary.com' in product.imageUrl:
-                    # Get the path after 'upload/'
-                    upload_index = url_parts.index('upload')
-                    public_id_parts = url_parts[upload_index + 2:]  # Skip version
-                    public_id = '/'.join(public_id_parts).rsplit('.', 1)[0]  # Remove extension
-                    cloudinary.uploader.destroy(public_id)
-                    print(f"Deleted image from Cloudinary: {public_id}")
-            except Exception as cloudinary_error:
-                print(f"Error deleting from Cloudinary: {cloudinary_error}")
-                pass  # Ignore cloudinary deletion errors
-        
-        db.session.delete(product)
+        Product.delete_owned(product_id, seller_id)
         db.session.commit()
+        invalidate_product_caches()
+        
+        # The image is removed off the request thread; a failed destroy only
+        # leaves an orphaned asset behind
+        public_id = cloudinary_public_id(product.imageUrl) if product.imageUrl else None
+        if public_id:
+            run_in_background(cloudinary.uploader.destroy, public_id)
         
         return jsonify({'message': 'Product deleted successfully'}), 200
         
     except Exception as e:
         db.session.rollback()
-        print(f"Error in delete_product: {e}")
+        logger.exception("Error in %s", request.endpoint)
         return jsonify({'error': str(e)}), 500
 
 # Inventory Management
@@ -309,106 +583,73 @@ def delete_product(product_id):
 @jwt_required()
 def update_inventory(product_id):
     try:
-        seller = get_current_seller()
-        if not seller:
+        seller_id = current_seller_id()
+        if not seller_id:
             return jsonify({'error': 'Seller profile not found'}), 404
         
-        # Get product with explicit query
-        product = Product.query.filter_by(
-            productId=product_id, 
-            sellerId=seller.sellerId
-        ).first()
-        
-        if not product:
-            return jsonify({'error': 'Product not found'}), 404
-        
-        data = request.get_json()
-        quantity_change = data.get('quantity_change')
-        
-        print(f"\n{'='*50}")
-        print(f"INVENTORY UPDATE REQUEST")
-        print(f"{'='*50}")
-        print(f"Product ID: {product_id}")
-        print(f"Product Name: {product.productName}")
-        print(f"Seller ID: {seller.sellerId}")
-        print(f"Request Data: {data}")
-        print(f"Quantity Change: {quantity_change} (type: {type(quantity_change)})")
-        
-        if quantity_change is None:
-            return jsonify({'error': 'quantity_change is required'}), 400
-        
-        quantity_change = int(quantity_change)
+        data, error = parse_json_body(InventoryChange)
+        if error:
+            return error
+        quantity_change = data.quantity_change
         
         if quantity_change == 0:
             return jsonify({'error': 'Quantity change cannot be zero'}), 400
         
-        # Check if inventory exists
-        inventory = Inventory.query.filter_by(productId=product_id).first()
+        now = datetime.utcnow()
         
-        if inventory:
-            print(f"Found existing inventory: ID={inventory.inventoryId}")
-            print(f"Current stock BEFORE: {inventory.quantityInStock}")
-            
-            # Update stock
-            old_stock = inventory.quantityInStock
-            inventory.quantityInStock = inventory.quantityInStock + quantity_change
-            
-            # Don't allow negative stock
-            if inventory.quantityInStock < 0:
-                inventory.quantityInStock = 0
-            
-            if quantity_change > 0:
-                inventory.lastRestocked = datetime.utcnow()
-            
-            inventory.updatedAt = datetime.utcnow()
+        # Adjust stock atomically in the database, clamped at zero, and only
+        # if the product belongs to this seller; no read-modify-write race
+        new_stock = Inventory.quantityInStock + quantity_change
+        values = {'quantityInStock': case((new_stock < 0, 0), else_=new_stock)}
+        if quantity_change > 0:
+            values['lastRestocked'] = now
+        
+        updated = db.session.execute(
+            update(Inventory)
+            .where(
+                Inventory.productId == product_id,
+                exists().where(Product.productId == product_id, Product.sellerId == seller_id)
+            )
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        
+        if not updated:
+            # Either not this seller's product, or it has no inventory row yet
+            product = Product.query.filter_by(
+                productId=product_id, 
+                sellerId=seller_id
+            ).first()
             
-            print(f"New stock AFTER calculation: {inventory.quantityInStock}")
-            print(f"Change: {old_stock} -> {inventory.quantityInStock}")
-        else:
-            print(f"No inventory found, creating new record")
-            initial_stock = max(0, quantity_change)
+            if not product:
+                return jsonify({'error': 'Product not found'}), 404
             
-            inventory = Inventory(
+            db.session.add(Inventory(
                 productId=product_id,
-                quantityInStock=initial_stock,
+                quantityInStock=max(0, quantity_change),
                 reorderLevel=10,
-                lastRestocked=datetime.utcnow() if quantity_change > 0 else None,
-                updatedAt=datetime.utcnow()
-            )
-            
-            db.session.add(inventory)
-            print(f"Created new inventory with stock: {initial_stock}")
+                lastRestocked=now if quantity_change > 0 else None
+            ))
         
-        # Commit to database
-        print(f"Committing to database...")
         db.session.commit()
-        print(f"✅ Commit successful!")
-        
-        # Verify the update
-        db.session.refresh(inventory)
-        final_stock = inventory.quantityInStock
-        
-        print(f"Final stock after refresh: {final_stock}")
-        print(f"{'='*50}\n")
+        invalidate_product_caches()
         
-        # Get fresh product data
-        product = Product.query.get(product_id)
+        # One read for the response, overwriting any stale identity-map state
+        product = Product.query.options(
+            joinedload(Product.inventory),
+            joinedload(Product.seller)
+        ).populate_existing().filter_by(productId=product_id).one()
         
         return jsonify({
             'message': 'Inventory updated successfully',
             'product': product.to_dict(),
-            'newStock': final_stock,
-            'inventoryId': inventory.inventoryId
+            'newStock': product.inventory.quantityInStock,
+            'inventoryId': product.inventory.inventoryId
         }), 200
         
-    except ValueError as ve:
-        print(f"❌ ValueError: {ve}")
-        return jsonify({'error': 'Invalid quantity value'}), 400
     except Exception as e:
         db.session.rollback()
-        print(f"❌ Error in update_inventory: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in %s", request.endpoint)
         return jsonify({'error': str(e)}), 500
     
     
@@ -416,26 +657,30 @@ def update_inventory(product_id):
 @jwt_required()
 def get_inventory_logs():
     try:
-        seller = get_current_seller()
+        seller_id = current_seller_id()
         
-        if not seller:
+        if not seller_id:
             return jsonify({'error': 'Seller profile not found'}), 404
         
-        products = Product.query.filter_by(sellerId=seller.sellerId).all()
+        def build():
+            products = Product.query.filter_by(sellerId=seller_id).options(
+                *strict_load(joinedload(Product.inventory))
+            ).all()
+            return {
+                'logs': [
+                    {
+                        'productId': p.productId,
+                        'productName': p.productName,
+                        'quantityInStock': p.inventory.quantityInStock if p.inventory else 0,
+                        'lastRestocked': p.inventory.lastRestocked.isoformat() if p.inventory and p.inventory.lastRestocked else None
+                    } for p in products
+                ]
+            }
         
-        return jsonify({
-            'logs': [
-                {
-                    'productId': p.productId,
-                    'productName': p.productName,
-                    'quantityInStock': p.inventory.quantityInStock if p.inventory else 0,
-                    'lastRestocked': p.inventory.lastRestocked.isoformat() if p.inventory and p.inventory.lastRestocked else None
-                } for p in products
-            ]
-        }), 200
+        return conditional_json(product_list_version(seller_id), build)
         
     except Exception as e:
-        print(f"Error in get_inventory_logs: {e}")
+        logger.exception("Error in %s", request.endpoint)
         return jsonify({'error': str(e)}), 500
 
 # Order Management
@@ -443,54 +688,57 @@ def get_inventory_logs():
 @jwt_required()
 def get_seller_orders():
     try:
-        seller = get_current_seller()
+        seller_id = current_seller_id()
         
-        if not seller:
+        if not seller_id:
             return jsonify({'error': 'Seller profile not found'}), 404
         
         status = request.args.get('status')
         limit = request.args.get('limit', type=int)
         
-        query = Order.query.filter_by(sellerId=seller.sellerId)
+        query = order_list_query().filter(Order.sellerId == seller_id)
         if status:
-            query = query.filter_by(status=status)
-        
-        query = query.order_by(Order.orderDate.desc())
-        
+            query = query.filter(Order.status == status)
+        
+        # Stream newest first, serializing one keyset batch at a time
+        batches = iter_batches(
+            query, (Order.orderDate, Order.orderId),
+            lambda row: (row.o_orderDate, row.o_orderId),
+            batch_size=min(limit, STREAM_BATCH_SIZE) if limit else STREAM_BATCH_SIZE,
+            descending=True
+        )
+        orders = chain.from_iterable(map(serialize_order_rows, batches))
         if limit:
-            query = query.limit(limit)
-        
-        orders = query.all()
+            orders = islice(orders, limit)
         
-        return jsonify({'orders': [order.to_dict() for order in orders]}), 200
+        return stream_json_list('orders', orders)
         
     except Exception as e:
-        print(f"Error in get_seller_orders: {e}")
+        logger.exception("Error in %s", request.endpoint)
         return jsonify({'error': str(e)}), 500
 
 @seller_bp.route('/orders/<int:order_id>/status', methods=['PUT'])
 @jwt_required()
 def update_order_status(order_id):
     try:
-        seller = get_current_seller()
+        seller_id = current_seller_id()
         
-        if not seller:
+        if not seller_id:
             return jsonify({'error': 'Seller profile not found'}), 404
         
-        order = Order.query.filter_by(orderId=order_id, sellerId=seller.sellerId).first()
+        order = Order.query.filter_by(orderId=order_id, sellerId=seller_id).first()
         if not order:
             return jsonify({'error': 'Order not found'}), 404
         
         data = request.get_json()
         new_status = data.get('status')
         
-        valid_statuses = ['Pending', 'Confirmed', 'Preparing', 'Ready', 'Delivered', 'Completed', 'Cancelled']
-        if new_status not in valid_statuses:
+        if new_status not in VALID_ORDER_STATUSES:
             return jsonify({'error': 'Invalid status'}), 400
         
         order.status = new_status
-        order.updatedAt = datetime.utcnow()
         db.session.commit()
+        invalidate_seller_stats(seller_id)
         
         return jsonify({
             'message': 'Order status updated successfully',
@@ -499,7 +747,7 @@ def update_order_status(order_id):
         
     except Exception as e:
         db.session.rollback()
-        print(f"Error in update_order_status: {e}")
+        logger.exception("Error in %s", request.endpoint)
         return jsonify({'error': str(e)}), 500
 
 # Revenue & Analytics
@@ -507,43 +755,40 @@ def update_order_status(order_id):
 @jwt_required()
 def get_revenue():
     try:
-        seller = get_current_seller()
+        seller_id = current_seller_id()
         
-        if not seller:
+        if not seller_id:
             return jsonify({'error': 'Seller profile not found'}), 404
         
+        # Normalize before keying the cache, so arbitrary ?period= strings
+        # cannot each create their own entry
         period = request.args.get('period', 'month')
+        if period not in REVENUE_PERIODS:
+            period = 'year'
         
-        now = datetime.utcnow()
-        if period == 'day':
-            start_date = now - timedelta(days=1)
-        elif period == 'week':
-            start_date = now - timedelta(weeks=1)
-        elif period == 'month':
-            start_date = now - timedelta(days=30)
-        else:
-            start_date = now - timedelta(days=365)
-        
-        orders = Order.query.filter(
-            Order.sellerId == seller.sellerId,
-            Order.status.in_(['Delivered', 'Completed']),
-            Order.orderDate >= start_date
-        ).all()
+        # Dashboards poll this; serve repeats from cache until orders change
+        cache_key = seller_stats_cache_key(seller_id, 'revenue', period)
+        payload = cache.get(cache_key)
+        if payload is not None:
+            return jsonify(payload), 200
         
-        total_revenue = sum(order.totalAmount for order in orders)
-        total_orders = len(orders)
+        start_date = datetime.utcnow() - REVENUE_PERIODS[period]
         
         revenue_by_day = db.session.query(
             func.date(Order.orderDate).label('date'),
             func.sum(Order.totalAmount).label('revenue'),
             func.count(Order.orderId).label('orders')
         ).filter(
-            Order.sellerId == seller.sellerId,
-            Order.status.in_(['Delivered', 'Completed']),
+            Order.sellerId == seller_id,
+            Order.status.in_(COMPLETED_ORDER_STATUSES),
             Order.orderDate >= start_date
         ).group_by(func.date(Order.orderDate)).all()
         
-        return jsonify({
+        # Period totals are the sum of the daily buckets; no second scan needed
+        total_revenue = sum(day.revenue or 0 for day in revenue_by_day)
+        total_orders = sum(day.orders for day in revenue_by_day)
+        
+        payload = {
             'period': period,
             'total_revenue': float(total_revenue) if total_revenue else 0,
             'total_orders': total_orders,
@@ -555,21 +800,29 @@ def get_revenue():
                     'orders': day.orders
                 } for day in revenue_by_day
             ]
-        }), 200
+        }
+        cache.set(cache_key, payload, timeout=SELLER_STATS_TIMEOUT)
+        
+        return jsonify(payload), 200
         
     except Exception as e:
-        print(f"Error in get_revenue: {e}")
+        logger.exception("Error in %s", request.endpoint)
         return jsonify({'error': str(e)}), 500
 
 @seller_bp.route('/analytics', methods=['GET'])
 @jwt_required()
 def get_analytics():
     try:
-        seller = get_current_seller()
+        seller_id = current_seller_id()
         
-        if not seller:
+        if not seller_id:
             return jsonify({'error': 'Seller profile not found'}), 404
         
+        cache_key = seller_stats_cache_key(seller_id, 'analytics')
+        payload = cache.get(cache_key)
+        if payload is not None:
+            return jsonify(payload), 200
+        
         top_products = db.session.query(
             Product.productId,
             Product.productName,
@@ -578,20 +831,20 @@ def get_analytics():
         ).join(OrderItem, Product.productId == OrderItem.productId)\
          .join(Order, OrderItem.orderId == Order.orderId)\
          .filter(
-            Product.sellerId == seller.sellerId,
-            Order.status.in_(['Delivered', 'Completed'])
+            Product.sellerId == seller_id,
+            Order.status.in_(COMPLETED_ORDER_STATUSES)
         ).group_by(Product.productId, Product.productName)\
          .order_by(func.sum(OrderItem.quantity).desc())\
          .limit(10).all()
         
-        total_orders = Order.query.filter_by(sellerId=seller.sellerId).count()
-        pending_orders = Order.query.filter_by(sellerId=seller.sellerId, status='Pending').count()
-        completed_orders = Order.query.filter(
-            Order.sellerId == seller.sellerId,
-            Order.status.in_(['Delivered', 'Completed'])
-        ).count()
+        # All three order counts in one pass over the seller's orders
+        total_orders, pending_orders, completed_orders = db.session.query(
+            func.count(Order.orderId),
+            func.coalesce(func.sum(case((Order.status == 'Pending', 1), else_=0)), 0),
+            func.coalesce(func.sum(case((Order.status.in_(COMPLETED_ORDER_STATUSES), 1), else_=0)), 0)
+        ).filter(Order.sellerId == seller_id).one()
         
-        return jsonify({
+        payload = {
             'top_products': [
                 {
                     'id': p.productId,
@@ -602,13 +855,17 @@ def get_analytics():
             ],
             'order_stats': {
                 'total': total_orders,
-                'pending': pending_orders,
-                'completed': completed_orders
+                # MySQL returns SUM() as DECIMAL
+                'pending': int(pending_orders),
+                'completed': int(completed_orders)
             }
-        }), 200
+        }
+        cache.set(cache_key, payload, timeout=SELLER_STATS_TIMEOUT)
+        
+        return jsonify(payload), 200
         
     except Exception as e:
-        print(f"Error in get_analytics: {e}")
+        logger.exception("Error in %s", request.endpoint)
         return jsonify({'error': str(e)}), 500
 
 
@@ -618,70 +875,69 @@ from sqlalchemy import func, text  # Add 'text' here
 
 # Replace your reservation endpoints with these fixed versions:
 
+def serialize_reservation_row(row):
+    """Seller reservation list entry from a reservation/customer column row"""
+    return {
+        'reservationId': row.reservationId,
+        'customerId': row.customerId,
+        'customerName': row.customerName or 'Unknown Customer',
+        'email': row.email,
+        'phoneNumber': row.phoneNumber,
+        'address': row.address,
+        'reservationDate': row.reservationDate.isoformat() if row.reservationDate else None,
+        'numberOfPeople': row.numberOfPeople,
+        'status': row.status,
+        'specialRequests': row.specialRequests,
+        'createdAt': row.createdAt.isoformat() if row.createdAt else None,
+        'updatedAt': row.updatedAt.isoformat() if row.updatedAt else None
+    }
+
 @seller_bp.route('/reservations', methods=['GET'])
 @jwt_required()
 def get_seller_reservations():
-    """Get all reservations with customer information using direct SQL"""
+    """Get all reservations with customer information"""
     try:
-        seller = get_current_seller()
+        seller_id = current_seller_id()
         
-        if not seller:
+        if not seller_id:
             return jsonify({'error': 'Seller profile not found'}), 404
         
         status = request.args.get('status')
+        if status and status not in VALID_RESERVATION_STATUSES:
+            return jsonify({'error': 'Invalid status'}), 400
         
-        # Use text() to wrap SQL query
-        query = text("""
-            SELECT 
-                r.reservationId,
-                r.customerId,
-                r.reservationDate,
-                r.numberOfPeople,
-                r.status,
-                r.specialRequests,
-                r.createdAt,
-                r.updatedAt,
-                c.customerName,
-                c.email,
-                c.phoneNumber,
-                c.address
-            FROM reservation r
-            LEFT JOIN customer c ON r.customerId = c.customerId
-        """ + (" WHERE r.status = :status" if status else "") + """
-            ORDER BY r.reservationDate DESC
-        """)
+        # Column projection built from the models: the status is always a bound
+        # parameter and both variants hit SQLAlchemy's compiled-statement cache
+        query = db.session.query(
+            Reservation.reservationId,
+            Reservation.customerId,
+            Reservation.reservationDate,
+            Reservation.numberOfPeople,
+            Reservation.status,
+            Reservation.specialRequests,
+            Reservation.createdAt,
+            Reservation.updatedAt,
+            Customer.customerName,
+            Customer.email,
+            Customer.phoneNumber,
+            Customer.address
+        ).outerjoin(Customer, Customer.customerId == Reservation.customerId)
         
-        # Execute with parameters if status filter exists
         if status:
-            result = db.session.execute(query, {'status': status})
-        else:
-            result = db.session.execute(query)
-        
-        # Convert results to list of dictionaries
-        reservations = []
-        for row in result:
-            reservation = {
-                'reservationId': row.reservationId,
-                'customerId': row.customerId,
-                'customerName': row.customerName or 'Unknown Customer',
-                'email': row.email,
-                'phoneNumber': row.phoneNumber,
-                'address': row.address,
-                'reservationDate': row.reservationDate.isoformat() if row.reservationDate else None,
-                'numberOfPeople': row.numberOfPeople,
-                'status': row.status,
-                'specialRequests': row.specialRequests,
-                'createdAt': row.createdAt.isoformat() if row.createdAt else None,
-                'updatedAt': row.updatedAt.isoformat() if row.updatedAt else None
-            }
-            reservations.append(reservation)
+            query = query.filter(Reservation.status == status)
         
-        return jsonify({'reservations': reservations}), 200
+        # Stream newest first in keyset batches, serializing row by row
+        batches = iter_batches(
+            query, (Reservation.reservationDate, Reservation.reservationId),
+            lambda row: (row.reservationDate, row.reservationId),
+            descending=True
+        )
+        return stream_json_list(
+            'reservations', chain.from_iterable(batches), serialize_reservation_row
+        )
         
     except Exception as e:
-        print(f"Error in get_seller_reservations: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in %s", request.endpoint)
         return jsonify({'error': str(e)}), 500
 
 
@@ -690,9 +946,9 @@ def get_seller_reservations():
 def get_reservation_details(reservation_id):
     """Get single reservation details with customer info"""
     try:
-        seller = get_current_seller()
+        seller_id = current_seller_id()
         
-        if not seller:
+        if not seller_id:
             return jsonify({'error': 'Seller profile not found'}), 404
         
         query = text("""
@@ -737,9 +993,7 @@ def get_reservation_details(reservation_id):
         return jsonify({'reservation': reservation}), 200
         
     except Exception as e:
-        print(f"Error in get_reservation_details: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in %s", request.endpoint)
         return jsonify({'error': str(e)}), 500
 
 
@@ -748,54 +1002,46 @@ def get_reservation_details(reservation_id):
 def update_reservation_status(reservation_id):
     """Update reservation status"""
     try:
-        seller = get_current_seller()
+        seller_id = current_seller_id()
         
-        if not seller:
+        if not seller_id:
             return jsonify({'error': 'Seller profile not found'}), 404
         
         data = request.get_json()
         new_status = data.get('status')
         
-        valid_statuses = ['Confirmed', 'Cancelled', 'Pending']
-        if new_status not in valid_statuses:
+        if new_status not in VALID_RESERVATION_STATUSES:
             return jsonify({'error': 'Invalid status'}), 400
         
-        # Update reservation status using text()
-        update_query = text("""
-            UPDATE reservation 
-            SET status = :status, updatedAt = :updated_at 
-            WHERE reservationId = :reservation_id
-        """)
+        # Single UPDATE (updatedAt comes from the column's onupdate); the
+        # matched-row count doubles as the existence check
+        updated = db.session.execute(
+            update(Reservation)
+            .where(Reservation.reservationId == reservation_id)
+            .values(status=new_status)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        
+        if not updated:
+            db.session.rollback()
+            return jsonify({'error': 'Reservation not found'}), 404
         
-        db.session.execute(
-            update_query, 
-            {
-                'status': new_status, 
-                'updated_at': datetime.utcnow(),
-                'reservation_id': reservation_id
-            }
-        )
+        # MySQL has no UPDATE ... RETURNING: read the row back inside the same
+        # transaction, before the commit
+        result = db.session.query(
+            Reservation.reservationId,
+            Reservation.customerId,
+            Reservation.reservationDate,
+            Reservation.numberOfPeople,
+            Reservation.status,
+            Reservation.specialRequests,
+            Reservation.createdAt,
+            Customer.customerName,
+            Customer.email
+        ).outerjoin(Customer, Customer.customerId == Reservation.customerId)\
+         .filter(Reservation.reservationId == reservation_id).one()
         db.session.commit()
         
-        # Fetch updated reservation with customer info using text()
-        query = text("""
-            SELECT 
-                r.reservationId,
-                r.customerId,
-                r.reservationDate,
-                r.numberOfPeople,
-                r.status,
-                r.specialRequests,
-                r.createdAt,
-                c.customerName,
-                c.email
-            FROM reservation r
-            LEFT JOIN customer c ON r.customerId = c.customerId
-            WHERE r.reservationId = :reservation_id
-        """)
-        
-        result = db.session.execute(query, {'reservation_id': reservation_id}).fetchone()
-        
         reservation = {
             'reservationId': result.reservationId,
             'customerId': result.customerId,
@@ -815,7 +1061,5 @@ def update_reservation_status(reservation_id):
         
     except Exception as e:
         db.session.rollback()
-        print(f"Error in update_reservation_status: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in %s", request.endpoint)
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
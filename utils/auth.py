@@ -0,0 +1,56 @@
+from functools import lru_cache
+from flask import g
+from flask_jwt_extended import get_jwt, get_jwt_identity
+
+
+@lru_cache(maxsize=1024)
+def parse_identity(identity):
+    """Split an identity string like "customer:123" into (user_type, user_id).
+
+    Pure function, memoized so repeat requests from the same user skip the parse.
+    Raises ValueError on a malformed identity.
+    """
+    user_type, sep, user_id = identity.partition(':')
+    if not sep:
+        raise ValueError('Invalid token format')
+    return user_type, int(user_id)
+
+
+def jwt_identity():
+    """Return (user_type, user_id) for the current JWT.
+
+    Read from the structured 'type' and 'user_id' claims every token is issued
+    with; tokens without them fall back to parsing the "customer:123" style
+    identity string. The result is cached on flask.g so handlers and helpers
+    can call this repeatedly within a request. Raises ValueError on a
+    malformed token.
+    """
+    if 'jwt_identity' in g:
+        return g.jwt_identity
+    
+    claims = get_jwt()
+    user_type, user_id = claims.get('type'), claims.get('user_id')
+    if user_type and isinstance(user_id, int):
+        g.jwt_identity = (user_type, user_id)
+        return g.jwt_identity
+    
+    identity = get_jwt_identity()
+    if not identity:
+        raise ValueError('Invalid token format')
+    
+    g.jwt_identity = parse_identity(identity)
+    return g.jwt_identity
+
+
+def current_seller_id():
+    """Return the logged-in seller's id from the JWT identity, or None.
+
+    The id travels in the token, so seller-only routes that just need to scope
+    queries by sellerId never load the Seller row. None for non-seller or
+    malformed tokens.
+    """
+    try:
+        user_type, user_id = jwt_identity()
+    except ValueError:
+        return None
+    return user_id if user_type == 'seller' else None
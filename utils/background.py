@@ -0,0 +1,36 @@
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Small pool for fire-and-forget calls to external services (Cloudinary)
+# whose result the response does not depend on
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('BACKGROUND_WORKERS', 4)),
+    thread_name_prefix='background'
+)
+
+RETRY_DELAYS = (1, 5, 15)
+
+
+def _run_with_retry(fn, args, kwargs):
+    for attempt, delay in enumerate((0,) + RETRY_DELAYS):
+        if delay:
+            time.sleep(delay)
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            if attempt == len(RETRY_DELAYS):
+                logger.exception("Background task %s failed, giving up", fn.__qualname__)
+            else:
+                logger.warning("Background task %s failed, retrying", fn.__qualname__)
+
+
+def run_in_background(fn, *args, **kwargs):
+    """Run fn(*args, **kwargs) on the background pool, retrying on error.
+
+    Tasks must not touch the request context or the SQLAlchemy session.
+    """
+    return _executor.submit(_run_with_retry, fn, args, kwargs)
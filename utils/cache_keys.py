@@ -0,0 +1,62 @@
+# Shared cache keys, so writers can invalidate what readers cache
+import uuid
+
+from flask import request
+
+from app import cache
+
+CATEGORIES_CACHE_KEY = 'categories_v1'
+PRODUCT_LIST_VERSION_KEY = 'product_list_version'
+PRODUCT_LIST_TIMEOUT = 30
+
+
+def _number(value, cast):
+    return None if value in (None, '') else cast(value)
+
+
+def product_list_cache_key():
+    """Cache key for the public product list, built from normalized filter args.
+
+    Numeric args are parsed before keying so equivalent spellings
+    (min_price=10 vs min_price=10.0) share an entry. The key embeds the
+    current list version, which product writes bump to drop every entry at once.
+    """
+    args = request.args
+    version = cache.get(PRODUCT_LIST_VERSION_KEY) or '0'
+    return 'products:{}:{}'.format(version, (
+        args.get('category') or None,
+        args.get('search') or None,
+        _number(args.get('seller_id'), int),
+        _number(args.get('min_price'), float),
+        _number(args.get('max_price'), float),
+        args.get('page', 1, type=int),
+        args.get('per_page', type=int),
+    ))
+
+
+def invalidate_product_caches():
+    """Drop cached categories and product list pages after a product write"""
+    cache.delete(CATEGORIES_CACHE_KEY)
+    cache.set(PRODUCT_LIST_VERSION_KEY, uuid.uuid4().hex, timeout=0)
+
+
+SELLER_STATS_TIMEOUT = 30
+
+
+def _seller_stats_version_key(seller_id):
+    return 'seller_stats_version:{}'.format(seller_id)
+
+
+def seller_stats_cache_key(seller_id, *parts):
+    """Cache key for one seller's revenue/analytics response.
+
+    Like the product list, the key embeds a per-seller version so a single
+    invalidate_seller_stats() call drops every period at once.
+    """
+    version = cache.get(_seller_stats_version_key(seller_id)) or '0'
+    return 'seller_stats:{}:{}:{}'.format(seller_id, version, ':'.join(map(str, parts)))
+
+
+def invalidate_seller_stats(seller_id):
+    """Drop a seller's cached revenue/analytics after their orders change"""
+    cache.set(_seller_stats_version_key(seller_id), uuid.uuid4().hex, timeout=0)
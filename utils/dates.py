@@ -0,0 +1,21 @@
+from datetime import datetime
+
+try:
+    from ciso8601 import parse_datetime as _parse_datetime
+except ImportError:  # pragma: no cover - pure-Python fallback
+    _parse_datetime = None
+
+
+def parse_iso_datetime(value):
+    """Parse an ISO 8601 timestamp, accepting a trailing 'Z' for UTC.
+
+    Uses the ciso8601 C parser when it is installed; otherwise falls back to
+    datetime.fromisoformat. Raises ValueError on malformed input either way.
+    """
+    if _parse_datetime is not None:
+        return _parse_datetime(value)
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        # Python < 3.11 rejects the 'Z' suffix
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
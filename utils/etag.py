@@ -0,0 +1,18 @@
+import hashlib
+from flask import current_app, jsonify, request
+
+
+def conditional_json(version, build):
+    """jsonify(build()) with a weak ETag derived from version, or 304 if unchanged.
+
+    version is anything whose repr changes whenever the payload would (e.g. a
+    row count plus MAX(updatedAt)). It is checked against If-None-Match before
+    build() runs, so an unchanged poll skips the query and serialization.
+    """
+    etag = hashlib.md5(repr(version).encode()).hexdigest()
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = jsonify(build())
+    response.set_etag(etag, weak=True)
+    return response
@@ -0,0 +1,14 @@
+from flask import current_app
+from sqlalchemy.orm import raiseload
+
+
+def strict_load(*options):
+    """Return loader options, plus raiseload('*') when lazy-load detection is on.
+
+    With SQLALCHEMY_RAISE_ON_LAZY_LOAD set (or in debug), any relationship the
+    given eager options miss raises instead of silently issuing an N+1 query.
+    In production the eager options are returned unchanged.
+    """
+    if current_app.debug or current_app.config.get('SQLALCHEMY_RAISE_ON_LAZY_LOAD'):
+        return options + (raiseload('*'),)
+    return options
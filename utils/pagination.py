@@ -0,0 +1,53 @@
+from flask import request
+from sqlalchemy import tuple_
+
+DEFAULT_PER_PAGE = 50
+MAX_PER_PAGE = 100
+
+
+def paginate_query(query):
+    """Paginate a query from the ?page= and ?per_page= request args.
+
+    per_page is capped at MAX_PER_PAGE so a single request can never pull an
+    unbounded number of rows.
+    """
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', DEFAULT_PER_PAGE, type=int)
+    return query.paginate(page=page, per_page=per_page, error_out=False, max_per_page=MAX_PER_PAGE)
+
+
+def pagination_meta(paginated):
+    """Pagination fields to merge into a list response"""
+    return {
+        'total': paginated.total,
+        'pages': paginated.pages,
+        'current_page': paginated.page,
+        'has_next': paginated.has_next,
+        'has_prev': paginated.has_prev
+    }
+
+
+STREAM_BATCH_SIZE = 500
+
+
+def iter_batches(query, key_columns, row_key, batch_size=STREAM_BATCH_SIZE, descending=False):
+    """Yield a query's results in fully fetched batches, paging by keyset.
+
+    Used to stream long lists. Unlike yield_per this never holds a server-side
+    cursor open, which pymysql cannot share with the eager/lazy loads and
+    per-batch queries that run between batches. key_columns must be unique
+    together; row_key(row) returns their values for a result row.
+    """
+    keys = tuple_(*key_columns)
+    query = query.order_by(*(column.desc() if descending else column for column in key_columns))
+    last = None
+    while True:
+        batch_query = query
+        if last is not None:
+            batch_query = batch_query.filter(keys < tuple_(*last) if descending else keys > tuple_(*last))
+        batch = batch_query.limit(batch_size).all()
+        if batch:
+            yield batch
+        if len(batch) < batch_size:
+            return
+        last = row_key(batch[-1])
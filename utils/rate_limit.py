@@ -0,0 +1,39 @@
+import time
+from functools import wraps
+from flask import jsonify
+from app import cache
+from utils.auth import jwt_identity
+
+
+def rate_limit(scope, *rules):
+    """Reject a user's requests with 429 once any (limit, seconds) rule is exceeded.
+
+    Fixed-window counters live in the shared cache (Redis when CACHE_REDIS_URL
+    is set, so limits hold across workers), keyed on the JWT identity. The
+    check runs before the view, so rejected requests do no work. Apply below
+    @jwt_required().
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                user_type, user_id = jwt_identity()
+            except ValueError:
+                return view(*args, **kwargs)
+
+            now = int(time.time())
+            for limit, seconds in rules:
+                window = now // seconds
+                key = f'rate:{scope}:{user_type}:{user_id}:{seconds}:{window}'
+                # add() only seeds a fresh window; inc() is atomic on Redis
+                cache.cache.add(key, 0, timeout=seconds)
+                if (cache.cache.inc(key) or 0) > limit:
+                    response = jsonify({'error': 'Too many requests, please slow down'})
+                    response.status_code = 429
+                    response.headers['Retry-After'] = str((window + 1) * seconds - now)
+                    response.headers['RateLimit-Limit'] = str(limit)
+                    return response
+
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
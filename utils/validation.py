@@ -0,0 +1,17 @@
+from flask import jsonify, request
+from pydantic import ValidationError
+
+
+def parse_json_body(schema):
+    """Parse and validate the raw request body against a pydantic model in one pass.
+
+    Returns (data, None) on success, or (None, response) with a 400 naming the
+    first invalid field, ready to return from the view.
+    """
+    try:
+        return schema.model_validate_json(request.get_data()), None
+    except ValidationError as e:
+        error = e.errors(include_url=False, include_context=False)[0]
+        location = '.'.join(str(part) for part in error['loc'])
+        message = f'{location}: {error["msg"]}' if location else error['msg']
+        return None, (jsonify({'error': message}), 400)